@@ -1,3 +1,10 @@
+from functools import lru_cache
+
+from . import batch
+from .alphabet import LATIN
+from .keycache import shared
+
+
 def gcd(a, b):
     while b:
         a, b = b, a % b
@@ -18,65 +25,43 @@ def mod_inverse(a, m):
     _, x, _ = extended_gcd(a, m)
     return (x % m + m) % m
 
-def encrypt(text, key):
-    if isinstance(key, str):
-        
-        a, b = map(int, key.split(','))
-    else:
-        a, b = key
-    
-    
-    if gcd(a, 26) != 1:
-        raise ValueError("The 'a' value must be coprime with 26")
-    
-    result = ""
-    for char in text:
-        if char.isalpha():
-            
-            if char.isupper():
-                x = ord(char) - ord('A')
-                
-                encrypted = (a * x + b) % 26
-                result += chr(encrypted + ord('A'))
-            else:
-                x = ord(char) - ord('a')
-                
-                encrypted = (a * x + b) % 26
-                result += chr(encrypted + ord('a'))
-        else:
-            result += char
-    return result
+@lru_cache(maxsize=None)
+def valid_a_values(m):
+    return tuple(a for a in range(1, m) if gcd(a, m) == 1)
 
-def decrypt(text, key):
+def parse_key(key):
     if isinstance(key, str):
-        
         a, b = map(int, key.split(','))
     else:
         a, b = key
+    return a, b
+
+@shared
+def compile_key(a, b, alphabet=LATIN):
+    m = alphabet.size
+    if gcd(a, m) != 1:
+        raise ValueError(f"The 'a' value must be coprime with {m}")
     
-    
-    if gcd(a, 26) != 1:
-        raise ValueError("The 'a' value must be coprime with 26")
-    
-    
-    a_inv = mod_inverse(a, 26)
+    a_inv = mod_inverse(a, m)
     if a_inv is None:
         raise ValueError("Cannot find multiplicative inverse")
     
-    result = ""
-    for char in text:
-        if char.isalpha():
-            
-            if char.isupper():
-                y = ord(char) - ord('A')
-                
-                decrypted = (a_inv * (y - b)) % 26
-                result += chr(decrypted + ord('A'))
-            else:
-                y = ord(char) - ord('a')
-                
-                decrypted = (a_inv * (y - b)) % 26
-                result += chr(decrypted + ord('a'))
-        else:
-            result += char
-    return result
\ No newline at end of file
+    forward = tuple((a * x + b) % m for x in range(m))
+    backward = tuple((a_inv * (y - b)) % m for y in range(m))
+    return alphabet.translation(forward), alphabet.translation(backward)
+
+def encrypt(text, key, alphabet=LATIN):
+    a, b = parse_key(key)
+    return text.translate(compile_key(a, b, alphabet)[0])
+
+def decrypt(text, key, alphabet=LATIN):
+    a, b = parse_key(key)
+    return text.translate(compile_key(a, b, alphabet)[1])
+
+def encrypt_many(texts, key, alphabet=LATIN):
+    a, b = parse_key(key)
+    return batch.translate_many(texts, compile_key(a, b, alphabet)[0])
+
+def decrypt_many(texts, key, alphabet=LATIN):
+    a, b = parse_key(key)
+    return batch.translate_many(texts, compile_key(a, b, alphabet)[1])
@@ -0,0 +1,134 @@
+import string
+from functools import lru_cache
+
+
+class Alphabet:
+    def __init__(self, symbols, name="Custom", noun="alphabet symbols", fold_case=True, merges=None):
+        if len(symbols) < 2:
+            raise ValueError("An alphabet needs at least two symbols.")
+        if len(set(symbols)) != len(symbols):
+            raise ValueError("Alphabet symbols must be unique.")
+
+        self.symbols = symbols
+        self.size = len(symbols)
+        self.name = name
+        self.noun = noun
+        self.fold_case = fold_case
+        self.index = {c: i for i, c in enumerate(symbols)}
+
+        # Each symbol gets a lowercase twin when one exists, so case-folding
+        # alphabets accept both and ciphers can keep the input's case.
+        lower = []
+        for c in symbols:
+            lc = c.lower()
+            if fold_case and len(lc) == 1 and lc not in self.index:
+                lower.append(lc)
+            else:
+                lower.append(c)
+        self.lower_symbols = ''.join(lower)
+        # When some symbols are caseless (digits, say), a lowercase letter
+        # can land on one and its case cannot come back on decryption, so
+        # such alphabets always answer in the canonical row.
+        self.cased = all(lc != c for lc, c in zip(self.lower_symbols, symbols))
+        for i, c in enumerate(self.lower_symbols):
+            self.index.setdefault(c, i)
+
+        self.merges = {}
+        for src, dst in (merges or {}).items():
+            if src not in self.index or dst not in self.index:
+                raise ValueError(f"Cannot merge {src!r} into {dst!r}: both must be in the alphabet.")
+            self.merges[symbols[self.index[src]]] = symbols[self.index[dst]]
+
+    def __repr__(self):
+        return f"Alphabet({self.name!r}, size={self.size})"
+
+    def __eq__(self, other):
+        if not isinstance(other, Alphabet):
+            return NotImplemented
+        return (self.symbols, self.fold_case, self.merges) == (other.symbols, other.fold_case, other.merges)
+
+    def __hash__(self):
+        return hash((self.symbols, self.fold_case, tuple(sorted(self.merges.items()))))
+
+    def __contains__(self, char):
+        return char in self.index
+
+    def contains(self, text):
+        index = self.index
+        return all(c in index for c in text)
+
+    def canonical(self, char):
+        return self.symbols[self.index[char]]
+
+    @lru_cache(maxsize=512)
+    def translation(self, perm, preserve_case=True):
+        symbols = self.symbols
+        lower = self.lower_symbols
+        target = lower if preserve_case and self.cased else symbols
+        table = {}
+        for i, c in enumerate(lower):
+            table[ord(c)] = target[perm[i]]
+        # Caseless symbols share a slot in both rows; the canonical row wins.
+        for i, c in enumerate(symbols):
+            table[ord(c)] = symbols[perm[i]]
+        return table
+
+
+LATIN = Alphabet(string.ascii_uppercase, name="Latin", noun="letters", merges={'J': 'I'})
+ALPHANUMERIC = Alphabet(string.ascii_uppercase + string.digits, name="Alphanumeric", noun="letters and digits")
+EXTENDED_LATIN = Alphabet(
+    string.ascii_uppercase + "ÀÁÂÃÄÅÆÇÈÉÊËÌÍÎÏÐÑÒÓÔÕÖØÙÚÛÜÝÞ",
+    name="Extended Latin",
+    noun="Latin letters",
+)
+
+ALPHABETS = {alphabet.name: alphabet for alphabet in (LATIN, ALPHANUMERIC, EXTENDED_LATIN)}
+
+
+def get_alphabet(name_or_symbols):
+    if isinstance(name_or_symbols, Alphabet):
+        return name_or_symbols
+    if name_or_symbols in ALPHABETS:
+        return ALPHABETS[name_or_symbols]
+    return Alphabet(name_or_symbols)
+
+
+def round_trip_failures(alphabet):
+    # Every table-driven cipher must give back the text it encrypted:
+    # exactly when it keeps case on a cased alphabet, in the canonical row
+    # otherwise (Monoalphabetic always answers in capitals).
+    from . import affine, caesar, monoalphabetic, substitution, vigenere
+
+    symbols = alphabet.symbols
+    text = f"{symbols} {alphabet.lower_symbols}, {symbols[::-1]}!"
+    canonical = ''.join(alphabet.canonical(c) if c in alphabet else c for c in text)
+    shuffled = symbols[5:] + symbols[:5]
+    checks = [
+        ("Caesar", caesar, alphabet.size // 3 + 1, True),
+        ("Vigenère", vigenere, symbols[3:8], True),
+        ("Affine", affine, f"{affine.valid_a_values(alphabet.size)[1]},7", True),
+        ("Substitution", substitution, shuffled, True),
+        ("Monoalphabetic", monoalphabetic, shuffled, False),
+    ]
+    failures = []
+    for name, module, key, keeps_case in checks:
+        expected = text if keeps_case and alphabet.cased else canonical
+        result = module.decrypt(module.encrypt(text, key, alphabet), key, alphabet)
+        if result != expected:
+            failures.append((name, result))
+    return failures
+
+
+def main():
+    failed = False
+    for alphabet in ALPHABETS.values():
+        failures = round_trip_failures(alphabet)
+        failed = failed or bool(failures)
+        print(f"{alphabet.name}: {'ok' if not failures else 'FAILED'}")
+        for name, result in failures:
+            print(f"  {name} gave back {result!r}")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
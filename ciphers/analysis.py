@@ -0,0 +1,101 @@
+import string
+from collections import Counter
+from math import log
+
+ENGLISH_FREQUENCIES = (
+    0.08167, 0.01492, 0.02782, 0.04253, 0.12702, 0.02228, 0.02015,
+    0.06094, 0.06966, 0.00153, 0.00772, 0.04025, 0.02406, 0.06749,
+    0.07507, 0.01929, 0.00095, 0.05987, 0.06327, 0.09056, 0.02758,
+    0.00978, 0.02360, 0.00150, 0.01974, 0.00074,
+)
+
+_LETTERS = tuple(zip(string.ascii_uppercase, string.ascii_lowercase))
+
+
+def common_prefix_length(a, b):
+    n = min(len(a), len(b))
+    if a[:n] == b[:n]:
+        return n
+    # Binary search compares only the still-undecided slice each round, so
+    # the total work stays linear and happens inside string comparison.
+    lo, hi = 0, n
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+def common_suffix_length(a, b, limit):
+    la, lb = len(a), len(b)
+    lo, hi = 0, limit
+    if a[la - hi:] == b[lb - hi:]:
+        return hi
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[la - mid:la - lo] == b[lb - mid:lb - lo]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+def count_letters(text):
+    counts = Counter(text)
+    return [counts[upper] + counts[lower] for upper, lower in _LETTERS]
+
+
+class LetterCounts:
+    def __init__(self, text=""):
+        self.text = text
+        self.counts = count_letters(text)
+
+    @property
+    def total(self):
+        return sum(self.counts)
+
+    def update(self, text):
+        # Only the edited span between the unchanged prefix and suffix is
+        # recounted.
+        old = self.text
+        if text is old or text == old:
+            return
+        prefix = common_prefix_length(old, text)
+        suffix = common_suffix_length(old, text, min(len(old), len(text)) - prefix)
+        removed = count_letters(old[prefix:len(old) - suffix])
+        added = count_letters(text[prefix:len(text) - suffix])
+        self.counts = [c - r + a for c, r, a in zip(self.counts, removed, added)]
+        self.text = text
+
+    def index_of_coincidence(self):
+        return index_of_coincidence(self.counts)
+
+    def chi_squared(self):
+        return chi_squared(self.counts)
+
+
+def index_of_coincidence(counts):
+    total = sum(counts)
+    if total < 2:
+        return 0.0
+    return sum(c * (c - 1) for c in counts) / (total * (total - 1))
+
+def chi_squared(counts, expected=ENGLISH_FREQUENCIES):
+    total = sum(counts)
+    if not total:
+        return 0.0
+    return sum((c - total * f) ** 2 / (total * f) for c, f in zip(counts, expected))
+
+
+class MonogramScorer:
+    # Average log-probability per letter under English letter frequencies;
+    # higher means more English-like.
+    def __init__(self, frequencies=ENGLISH_FREQUENCIES):
+        self.logs = [log(f) for f in frequencies]
+
+    def __call__(self, text):
+        counts = count_letters(text)
+        total = sum(counts)
+        if not total:
+            return float("-inf")
+        return sum(c * l for c, l in zip(counts, self.logs)) / total
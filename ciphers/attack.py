@@ -0,0 +1,146 @@
+import argparse
+import heapq
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from . import normalize, playfair, vigenere
+from .alphabet import LATIN
+from .analysis import MonogramScorer
+from .ngrams import DEFAULT_PATH, NgramScorer
+
+CIPHERS = {"vigenere": vigenere, "playfair": playfair}
+
+
+def default_scorer():
+    # Quadgram fitness (or the longest n-grams the table holds) when a table
+    # has been built with python -m ciphers.ngrams, letter frequencies
+    # otherwise.
+    if os.path.exists(DEFAULT_PATH):
+        return NgramScorer(DEFAULT_PATH)
+    return MonogramScorer()
+
+def canonical_key(cipher, key, alphabet=LATIN):
+    # Keys that decrypt identically map to the same canonical form: a
+    # Vigenère key reduced to its shortest repeating unit, or the full
+    # Playfair square.
+    if cipher == "playfair":
+        return ''.join(''.join(row) for row in playfair.generate_key_table(key, alphabet))
+    key = ''.join(alphabet.canonical(c) for c in key)
+    for period in range(1, len(key) + 1):
+        if len(key) % period == 0 and key[:period] * (len(key) // period) == key:
+            return key[:period]
+    return key
+
+def unique_candidates(cipher, words, alphabet=LATIN):
+    # Only whole canonical keys are compared, so a set is all it takes.
+    seen = set()
+    total = 0
+    candidates = []
+    for word in words:
+        word = word.strip()
+        if not word or not alphabet.contains(word):
+            continue
+        total += 1
+        key = canonical_key(cipher, word, alphabet)
+        if key not in seen:
+            seen.add(key)
+            candidates.append(word)
+    return candidates, total
+
+def playfair_ciphertext(text, alphabet=LATIN):
+    # Line breaks and other whitespace are only layout; any other symbol
+    # outside the grid would make every decryption fail.
+    text = normalize.whitespace()(text)
+    folded = text.translate(playfair.folding(alphabet))
+    stray = sorted(set(folded) - set(playfair.grid_symbols(alphabet)))
+    if stray:
+        raise ValueError(f"Playfair ciphertext may only contain {alphabet.noun}, not {''.join(stray)!r}.")
+    if not folded:
+        raise ValueError("The ciphertext has no letters to attack.")
+    if len(folded) % 2:
+        raise ValueError("Playfair ciphertext must have an even number of letters.")
+    return text
+
+def ciphertext_prefix(cipher, text, length, alphabet=LATIN):
+    if cipher == "playfair":
+        text = text.translate(playfair.folding(alphabet))
+        return text[:min(length, len(text)) // 2 * 2]
+    return text[:length]
+
+def score_shard(cipher, prefix, keys, top, scorer, alphabet=LATIN):
+    decrypt = CIPHERS[cipher].decrypt
+    scored = ((scorer(decrypt(prefix, key, alphabet)), key) for key in keys)
+    return heapq.nlargest(top, scored)
+
+def dictionary_attack(ciphertext, words, cipher="vigenere", prefix_length=300, top=10,
+                      workers=None, scorer=None, alphabet=LATIN):
+    if cipher not in CIPHERS:
+        raise ValueError(f"Dictionary attack supports {', '.join(CIPHERS)}, not {cipher!r}.")
+    if cipher == "playfair":
+        ciphertext = playfair_ciphertext(ciphertext, alphabet)
+    scorer = scorer or default_scorer()
+    started = time.perf_counter()
+
+    candidates, total = unique_candidates(cipher, words, alphabet)
+    prefix = ciphertext_prefix(cipher, ciphertext, prefix_length, alphabet)
+
+    workers = workers or os.cpu_count() or 1
+    shard_size = max(1000, len(candidates) // (workers * 4) + 1)
+    shards = [candidates[i:i + shard_size] for i in range(0, len(candidates), shard_size)]
+    best = []
+    if workers == 1 or len(shards) <= 1:
+        for shard in shards:
+            best.extend(score_shard(cipher, prefix, shard, top, scorer, alphabet))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(score_shard, cipher, prefix, shard, top, scorer, alphabet) for shard in shards]
+            for future in futures:
+                best.extend(future.result())
+    scored_at = time.perf_counter()
+
+    # Only the best prefix candidates are decrypted and scored in full.
+    decrypt = CIPHERS[cipher].decrypt
+    results = []
+    for _, key in heapq.nlargest(top, best):
+        plaintext = decrypt(ciphertext, key, alphabet)
+        results.append((scorer(plaintext), key, plaintext))
+    results.sort(key=lambda result: result[0], reverse=True)
+
+    elapsed = time.perf_counter() - started
+    return {
+        "results": results,
+        "words": total,
+        "tried": len(candidates),
+        "skipped": total - len(candidates),
+        "seconds": elapsed,
+        "keys_per_second": len(candidates) / (scored_at - started) if scored_at > started else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dictionary attack on Vigenère and Playfair keywords.")
+    parser.add_argument("cipher", choices=sorted(CIPHERS))
+    parser.add_argument("ciphertext", help="file containing the ciphertext")
+    parser.add_argument("wordlist", help="file with one candidate keyword per line")
+    parser.add_argument("--prefix", type=int, default=300, help="ciphertext characters used to rank keys")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    try:
+        with open(args.ciphertext, encoding="utf-8") as f:
+            ciphertext = f.read()
+        with open(args.wordlist, encoding="utf-8", errors="ignore") as f:
+            report = dictionary_attack(ciphertext, f, args.cipher, args.prefix, args.top, args.workers)
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        parser.exit(1, f"{parser.prog}: {e}\n")
+
+    for score, key, plaintext in report["results"]:
+        print(f"{score:9.4f}  {key:<20} {plaintext[:60]!r}")
+    print(f"{report['tried']:,} keys tried ({report['skipped']:,} duplicates skipped) "
+          f"in {report['seconds']:.2f} s, {report['keys_per_second']:,.0f} keys/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+from itertools import accumulate
+
+
+def as_list(texts):
+    return texts if isinstance(texts, list) else list(texts)
+
+def split(joined, lengths):
+    offsets = list(accumulate(lengths, initial=0))
+    return [joined[start:end] for start, end in zip(offsets, offsets[1:])]
+
+def split_strided(joined, strides, lengths):
+    return [joined[start:start + n] for start, n in zip(accumulate(strides, initial=0), lengths)]
+
+def translate_many(texts, table):
+    # Tables built by Alphabet.translation map one character to one
+    # character, so offsets in the joined text line up with the records.
+    texts = as_list(texts)
+    return split(''.join(texts).translate(table), map(len, texts))
@@ -1,12 +1,21 @@
-def encrypt(text, shift):
-    result = ""
-    for char in text:
-        if char.isalpha():
-            base = ord('A') if char.isupper() else ord('a')
-            result += chr((ord(char) - base + shift) % 26 + base)
-        else:
-            result += char
-    return result
-
-def decrypt(text, shift):
-    return encrypt(text, -shift)
+from . import batch
+from .alphabet import LATIN
+from .keycache import shared
+
+
+@shared
+def compile_key(shift, alphabet=LATIN):
+    n = alphabet.size
+    return alphabet.translation(tuple((i + shift) % n for i in range(n)))
+
+def encrypt(text, shift, alphabet=LATIN):
+    return text.translate(compile_key(shift, alphabet))
+
+def decrypt(text, shift, alphabet=LATIN):
+    return encrypt(text, -shift, alphabet)
+
+def encrypt_many(texts, shift, alphabet=LATIN):
+    return batch.translate_many(texts, compile_key(shift, alphabet))
+
+def decrypt_many(texts, shift, alphabet=LATIN):
+    return encrypt_many(texts, -shift, alphabet)
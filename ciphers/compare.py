@@ -0,0 +1,87 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from . import affine, caesar, monoalphabetic, playfair, rail_fence, substitution, transposition, vigenere
+
+CIPHERS = {
+    "Playfair": playfair,
+    "Monoalphabetic": monoalphabetic,
+    "Caesar": caesar,
+    "Vigenère": vigenere,
+    "Substitution": substitution,
+    "Rail Fence": rail_fence,
+    "Transposition": transposition,
+    "Affine": affine,
+}
+
+# Ciphers with Python-level work per character (Playfair's digraph split,
+# Rail Fence's permutation build) run in worker processes; the others are
+# table lookups or slices that finish before a process round trip would.
+HEAVY_CIPHERS = {"Playfair", "Rail Fence"}
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def process_pool():
+    # Started on first use and kept for the life of the process, so later
+    # comparisons reuse warm workers and their compiled keys. The workers
+    # are not forked from the app: a fork taken while another session's
+    # thread holds a lock (the key cache's, say) leaves that lock held in
+    # the child forever.
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _pool = ProcessPoolExecutor(max_workers=min(len(HEAVY_CIPHERS), os.cpu_count() or 1),
+                                        mp_context=multiprocessing.get_context(method))
+        return _pool
+
+def reset_pool(pool):
+    # Called when a worker died (killed for memory, say); the next
+    # comparison starts a fresh pool instead of failing on the broken one.
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+def run_cipher(name, text, key, mode="encrypt"):
+    fn = getattr(CIPHERS[name], mode)
+    started = time.perf_counter()
+    result = fn(text, key)
+    return result, time.perf_counter() - started
+
+def compare(text, keys, mode="encrypt", on_result=None):
+    # Runs every cipher in keys (name -> validated key) at once and calls
+    # on_result(name, outcome) in completion order, where outcome is
+    # (result, seconds) or the exception raised. Returns all outcomes.
+    outcomes = {}
+    with ThreadPoolExecutor(max_workers=max(1, len(keys))) as threads:
+        futures = {}
+        for name, key in keys.items():
+            executor = process_pool() if name in HEAVY_CIPHERS else threads
+            try:
+                future = executor.submit(run_cipher, name, text, key, mode)
+            except BrokenProcessPool:
+                reset_pool(executor)
+                executor = process_pool()
+                future = executor.submit(run_cipher, name, text, key, mode)
+            futures[future] = name, executor
+        for future in as_completed(futures):
+            name, executor = futures[future]
+            try:
+                outcome = future.result()
+            except BrokenProcessPool as e:
+                reset_pool(executor)
+                outcome = e
+            except Exception as e:
+                outcome = e
+            outcomes[name] = outcome
+            if on_result:
+                on_result(name, outcome)
+    return outcomes
@@ -0,0 +1,131 @@
+import functools
+import os
+import sys
+import threading
+from collections import Counter, OrderedDict
+
+MAX_ENTRIES = int(os.environ.get("CIPHER_APP_KEY_CACHE_ENTRIES", 2048))
+MAX_BYTES = int(os.environ.get("CIPHER_APP_KEY_CACHE_BYTES", 64 * 1024 * 1024))
+
+
+def approximate_size(value, seen=None):
+    # Deep size of a compiled key: containers, their items, instance
+    # attributes, and the positions held by an itemgetter.
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(approximate_size(k, seen) + approximate_size(v, seen) for k, v in value.items())
+    elif isinstance(value, (tuple, list, set, frozenset)):
+        size += sum(approximate_size(item, seen) for item in value)
+    elif type(value).__name__ == "itemgetter":
+        size += approximate_size(value.__reduce__()[1], seen)
+    if hasattr(value, "__dict__"):
+        size += approximate_size(vars(value), seen)
+    return size
+
+
+class KeyCache:
+    # Compiled key state (translation tables, Playfair squares, rail
+    # permutations) shared by every session in the process. Entries are
+    # kept in LRU order within both an entry and an approximate byte
+    # budget; when several threads ask for the same missing key, one
+    # compiles it and the others wait for its result.
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.waits = 0
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, namespace, args, compile):
+        entry_key = (namespace, args)
+        while True:
+            with self._lock:
+                if entry_key in self._entries:
+                    self._entries.move_to_end(entry_key)
+                    self.hits += 1
+                    return self._entries[entry_key]
+                pending = self._pending.get(entry_key)
+                if pending is None:
+                    pending = self._pending[entry_key] = threading.Event()
+                    break
+                self.waits += 1
+            # Another thread is compiling this key; if it fails, the next
+            # round compiles it here and raises the error to this caller too.
+            pending.wait()
+
+        try:
+            value = compile(*args)
+            # Sized once, when compiled; Playfair digraph tables that fill
+            # in later are counted as they were then.
+            size = approximate_size(value)
+            with self._lock:
+                self.misses += 1
+                if size > self.max_bytes:
+                    return value
+                self._entries[entry_key] = value
+                self._sizes[entry_key] = size
+                self.bytes += size
+                while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self.bytes -= self._sizes.pop(evicted)
+                    self.evictions += 1
+            return value
+        finally:
+            with self._lock:
+                del self._pending[entry_key]
+            pending.set()
+
+    def clear(self, namespace=None):
+        with self._lock:
+            if namespace is None:
+                self._entries.clear()
+                self._sizes.clear()
+                self.bytes = 0
+            else:
+                for entry_key in [k for k in self._entries if k[0] == namespace]:
+                    del self._entries[entry_key]
+                    self.bytes -= self._sizes.pop(entry_key)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "waits": self.waits,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "by_namespace": dict(Counter(namespace for namespace, _ in self._entries)),
+            }
+
+
+KEY_CACHE = KeyCache()
+
+
+def shared(fn):
+    # Drop-in replacement for lru_cache on functions that compile a key;
+    # positional arguments only, as they form the cache key.
+    namespace = f"{fn.__module__.rpartition('.')[2]}.{fn.__name__}"
+
+    @functools.wraps(fn)
+    def cached(*args):
+        return KEY_CACHE.get(namespace, args, fn)
+
+    cached.cache_clear = lambda: KEY_CACHE.clear(namespace)
+    return cached
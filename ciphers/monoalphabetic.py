@@ -1,15 +1,35 @@
-import string
+from . import batch
+from .alphabet import LATIN
+from .keycache import shared
 
-def generate_substitution(key):
-    key = ''.join(dict.fromkeys(key.upper()))
-    alphabet = string.ascii_uppercase
-    key_map = key + ''.join([c for c in alphabet if c not in key])
-    return dict(zip(alphabet, key_map)), dict(zip(key_map, alphabet))
 
-def encrypt(text, key):
-    sub, _ = generate_substitution(key)
-    return ''.join(sub.get(c.upper(), c) for c in text)
+def key_order(key, alphabet=LATIN):
+    order = dict.fromkeys(alphabet.index[c] for c in key if c in alphabet)
+    order.update(dict.fromkeys(range(alphabet.size)))
+    return tuple(order)
 
-def decrypt(text, key):
-    _, rev_sub = generate_substitution(key)
-    return ''.join(rev_sub.get(c.upper(), c) for c in text)
+def generate_substitution(key, alphabet=LATIN):
+    symbols = alphabet.symbols
+    key_map = ''.join(symbols[i] for i in key_order(key, alphabet))
+    return dict(zip(symbols, key_map)), dict(zip(key_map, symbols))
+
+@shared
+def compile_key(key, alphabet=LATIN):
+    forward = key_order(key, alphabet)
+    backward = [0] * alphabet.size
+    for i, j in enumerate(forward):
+        backward[j] = i
+    return (alphabet.translation(forward, preserve_case=False),
+            alphabet.translation(tuple(backward), preserve_case=False))
+
+def encrypt(text, key, alphabet=LATIN):
+    return text.translate(compile_key(key, alphabet)[0])
+
+def decrypt(text, key, alphabet=LATIN):
+    return text.translate(compile_key(key, alphabet)[1])
+
+def encrypt_many(texts, key, alphabet=LATIN):
+    return batch.translate_many(texts, compile_key(key, alphabet)[0])
+
+def decrypt_many(texts, key, alphabet=LATIN):
+    return batch.translate_many(texts, compile_key(key, alphabet)[1])
@@ -0,0 +1,154 @@
+import argparse
+import mmap
+import os
+import string
+import struct
+import sys
+from array import array
+from collections import Counter
+from itertools import repeat
+from math import log10
+from operator import add, mul
+
+MAGIC = b"NGRM"
+VERSION = 1
+HEADER = struct.Struct("<4sBB2x")
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "data", "english_ngrams.bin")
+
+_LETTERS = string.ascii_uppercase.encode() + string.ascii_lowercase.encode()
+_TO_CODES = bytes.maketrans(_LETTERS, bytes(range(26)) * 2)
+_NON_LETTERS = bytes(b for b in range(256) if b not in _LETTERS)
+
+
+def letter_codes(text):
+    # Letters as bytes 0..25; everything else is dropped.
+    return text.encode("ascii", "ignore").translate(_TO_CODES, _NON_LETTERS)
+
+def packed_indices(codes, n):
+    # Base-26 index of every n-gram, built as a chain of C-level maps over
+    # shifted views of the codes rather than a Python loop.
+    indices = iter(codes)
+    for k in range(1, n):
+        indices = map(add, map(mul, indices, repeat(26)), memoryview(codes)[k:])
+    return indices
+
+def table_offsets(max_n):
+    offset = HEADER.size + 4 * max_n
+    offsets = []
+    for n in range(1, max_n + 1):
+        offsets.append(offset)
+        offset += 4 * 26 ** n
+    return offsets
+
+
+class NgramTable:
+    def __init__(self, path=DEFAULT_PATH):
+        if sys.byteorder != "little":
+            raise ValueError("N-gram tables are stored little-endian.")
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.max_n = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not an n-gram table.")
+        view = memoryview(self._mmap)
+        self.floors = struct.unpack_from(f"<{self.max_n}f", self._mmap, HEADER.size)
+        self.logs = [
+            view[offset:offset + 4 * 26 ** n].cast("f")
+            for n, offset in zip(range(1, self.max_n + 1), table_offsets(self.max_n))
+        ]
+
+    def score(self, text, n=None):
+        n = n or self.max_n
+        if not 1 <= n <= self.max_n:
+            raise ValueError(f"The n-gram table only holds 1- to {self.max_n}-grams.")
+        codes = letter_codes(text)
+        count = len(codes) - n + 1
+        if count <= 0:
+            return float("-inf")
+        return sum(map(self.logs[n - 1].__getitem__, packed_indices(codes, n))) / count
+
+
+_TABLES = {}
+
+def open_table(path=DEFAULT_PATH):
+    # One mapping per process and path; the pages themselves come from the
+    # OS page cache and are shared by every process mapping the file.
+    path = os.path.abspath(path)
+    if path not in _TABLES:
+        _TABLES[path] = NgramTable(path)
+    return _TABLES[path]
+
+
+class NgramScorer:
+    def __init__(self, path=DEFAULT_PATH, n=4):
+        self.path = os.path.abspath(path)
+        self.table = open_table(self.path)
+        # A table built with a smaller --max-n scores with its longest n-grams.
+        self.n = min(n, self.table.max_n)
+
+    def __getstate__(self):
+        return {"path": self.path, "n": self.n}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"], state["n"])
+
+    def __call__(self, text):
+        return self.table.score(text, self.n)
+
+
+def build_table(corpus_paths, out_path=DEFAULT_PATH, max_n=4, chunk_size=1 << 20):
+    counts = [Counter() for _ in range(max_n)]
+    carry = b""
+    for corpus_path in corpus_paths:
+        with open(corpus_path, encoding="utf-8", errors="ignore") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                codes = carry + letter_codes(chunk)
+                # Only n-grams ending in the new text are counted; the carried
+                # tail was counted with the previous chunk.
+                for n in range(1, max_n + 1):
+                    start = max(0, len(carry) - n + 1)
+                    counts[n - 1].update(packed_indices(codes[start:], n))
+                carry = codes[-(max_n - 1):] if max_n > 1 else b""
+
+    floors = []
+    tables = []
+    for n, counter in enumerate(counts, 1):
+        total = sum(counter.values())
+        if not total:
+            raise ValueError("The corpus contains no letters.")
+        floor = log10(0.01 / total)
+        table = array("f", repeat(floor, 26 ** n))
+        for index, count in counter.items():
+            table[index] = log10(count / total)
+        floors.append(floor)
+        tables.append(table)
+
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, max_n))
+        f.write(struct.pack(f"<{max_n}f", *floors))
+        for table in tables:
+            if sys.byteorder != "little":
+                table.byteswap()
+            table.tofile(f)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a memory-mapped n-gram table from a text corpus.")
+    parser.add_argument("corpus", nargs="+", help="plain-text corpus files")
+    parser.add_argument("-o", "--output", default=DEFAULT_PATH)
+    parser.add_argument("--max-n", type=int, default=4)
+    args = parser.parse_args(argv)
+    print(build_table(args.corpus, args.output, args.max_n))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import re
+from bisect import bisect_right
+from functools import lru_cache
+
+# After a maximal run of pairs with two different letters comes either a
+# doubled letter, which gets a filler, or a lone last letter, which gets
+# the pad.
+_DIGRAPH_RUN = re.compile(r"((?:(.)(?!\2).)*)(?:(.)(?=.)|(.))?", re.DOTALL)
+
+
+class Normalizer:
+    # A compiled str.translate table that folds case, merges letters and
+    # deletes (maps to None) everything the cipher should not see, in one
+    # pass over the text.
+    def __init__(self, table):
+        self.table = table
+        deleted = ''.join(chr(c) for c, v in table.items() if v is None)
+        self._deleted = re.compile(f"[{re.escape(deleted)}]") if deleted else None
+
+    def __call__(self, text):
+        return text.translate(self.table)
+
+    def with_offsets(self, text):
+        # Also returns the deleted characters as (position, character)
+        # pairs, so that restore() can put them back into an output.
+        removed = [(m.start(), m.group()) for m in self._deleted.finditer(text)] if self._deleted else []
+        return text.translate(self.table), removed
+
+
+@lru_cache(maxsize=None)
+def whitespace():
+    # Every character str.split() splits on; all of them are in the BMP.
+    return Normalizer(dict.fromkeys(c for c in range(0x10000) if chr(c).isspace()))
+
+def digraph_text(text, filler="x", pad="z", inserted=None):
+    # The text as a run of digraphs with no doubled pair, in one regex scan.
+    # When inserted is a list, the positions (in the input text) before
+    # which a filler or pad went in are appended to it.
+    def segment(match):
+        run, doubled, last = match.group(1, 3, 4)
+        if doubled:
+            if inserted is not None:
+                inserted.append(match.end(3))
+            return run + doubled + filler
+        if last:
+            if inserted is not None:
+                inserted.append(match.end(4))
+            return run + last + pad
+        return run
+    return _DIGRAPH_RUN.sub(segment, text)
+
+def restore(output, removed, inserted=()):
+    # Puts removed characters back at their original places in a cipher
+    # output that keeps the normalized text's positions, skipping over any
+    # characters added at the sorted positions in inserted.
+    pieces = []
+    last = 0
+    for k, (position, char) in enumerate(removed):
+        at = position - k
+        at += bisect_right(inserted, at)
+        pieces.append(output[last:at])
+        pieces.append(char)
+        last = at
+    pieces.append(output[last:])
+    return ''.join(pieces)
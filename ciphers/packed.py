@@ -0,0 +1,132 @@
+import re
+import string
+import struct
+
+from . import batch
+
+# Packed files store text as 5-bit codes, eight codes to every five bytes,
+# after a header holding the number of codes:
+#   0-25  letters a-z (case is set by the toggle code)
+#   26    space
+#   27    newline
+#   28    toggle between lowercase and uppercase
+#   29    escape, followed by 2 hex codes for characters below U+0100
+#   30    escape, followed by 6 hex codes for any other character
+#   31    unused
+# Internally a code string is written with the base-32 digits 0-9a-v, so a
+# hex payload digit is also its own code and int(codes, 32) packs the bits.
+MAGIC = b"CPK5"
+VERSION = 1
+HEADER = struct.Struct("<4sBxxxQ")
+EXTENSION = "c5"
+
+DIGITS = string.digits + string.ascii_lowercase[:22]
+SPACE, NEWLINE, TOGGLE, ESCAPE_BYTE, ESCAPE_WIDE, UNUSED = DIGITS[26:]
+
+_UPPER_RUN = re.compile(r"([A-Z](?:[^a-z]*[A-Z])?)")
+_ESCAPED = re.compile("\x01([a-pA-P]{2})|\x02([a-pA-P]{6})")
+_ESCAPE_HEX = str.maketrans("abcdefghijklmnopABCDEFGHIJKLMNOP", "0123456789abcdef" * 2)
+
+
+class _CodeTable(dict):
+    # str.translate table from text to code digits; characters without a
+    # code of their own are escaped on first use.
+    def __missing__(self, ordinal):
+        if ordinal < 0x100:
+            codes = ESCAPE_BYTE + format(ordinal, "02x")
+        else:
+            codes = ESCAPE_WIDE + format(ordinal, "06x")
+        self[ordinal] = codes
+        return codes
+
+
+_TO_CODES = _CodeTable(str.maketrans(
+    string.ascii_lowercase + string.ascii_uppercase + " \n", DIGITS[:26] * 2 + SPACE + NEWLINE))
+_FROM_CODES = (
+    str.maketrans(DIGITS[:28] + ESCAPE_BYTE + ESCAPE_WIDE, string.ascii_lowercase + " \n\x01\x02"),
+    str.maketrans(DIGITS[:28] + ESCAPE_BYTE + ESCAPE_WIDE, string.ascii_uppercase + " \n\x01\x02"),
+)
+_BYTE_DIGITS = bytes.maketrans(bytes(range(32)), DIGITS.encode())
+
+
+def is_packed(data):
+    return data[:len(MAGIC)] == MAGIC
+
+def packed_size(count):
+    return (count + 7) // 8 * 5
+
+def to_codes(text):
+    # Uppercase runs are bracketed by toggles; anything between two capitals
+    # that is not a lowercase letter stays inside the run.
+    pieces = _UPPER_RUN.split(text)
+    pieces[0::2] = [piece.translate(_TO_CODES) for piece in pieces[0::2]]
+    pieces[1::2] = [TOGGLE + piece.translate(_TO_CODES) + TOGGLE for piece in pieces[1::2]]
+    return ''.join(pieces)
+
+def from_codes(codes):
+    if UNUSED in codes:
+        raise ValueError("Packed data contains an unknown code.")
+    segments = codes.split(TOGGLE)
+    segments[0::2] = [segment.translate(_FROM_CODES[0]) for segment in segments[0::2]]
+    segments[1::2] = [segment.translate(_FROM_CODES[1]) for segment in segments[1::2]]
+    text = ''.join(segments)
+    if "\x01" in text or "\x02" in text:
+        text = _ESCAPED.sub(_unescape, text)
+    return text
+
+def _unescape(match):
+    return chr(int((match.group(1) or match.group(2)).translate(_ESCAPE_HEX), 16))
+
+def pack_codes(codes):
+    codes += "0" * (-len(codes) % 8)
+    return int(codes, 32).to_bytes(len(codes) // 8 * 5, "big") if codes else b""
+
+def _word_mask(word, words):
+    return int.from_bytes(word.to_bytes(8, "big") * words, "big")
+
+def unpack_codes(payload):
+    # Each 5-byte group is widened to 8 bytes, then the 40 bits are spread
+    # out to one code per byte by halving: 20-bit, 10-bit and 5-bit fields,
+    # each step a mask and shift over the whole payload as one integer.
+    words = len(payload) // 5
+    wide = bytearray(8 * words)
+    for k in range(5):
+        wide[3 + k::8] = payload[k::5]
+    value = int.from_bytes(wide, "big")
+    for low, width, shift in ((0xFFFFF, 20, 12), (0x3FF000003FF, 10, 6), (0x1F001F001F001F, 5, 3)):
+        mask = _word_mask(low, words)
+        value = ((value & (mask << width)) << shift) | (value & mask)
+    return value.to_bytes(8 * words, "big").translate(_BYTE_DIGITS).decode("ascii")
+
+def _read_header(data):
+    if len(data) < HEADER.size or not is_packed(data):
+        raise ValueError("Not a packed ciphertext file.")
+    magic, version, count = HEADER.unpack_from(data)
+    if version != VERSION:
+        raise ValueError(f"Unsupported packed format version {version}.")
+    if len(data) - HEADER.size != packed_size(count):
+        raise ValueError("Packed data is truncated or corrupt.")
+    return count
+
+def pack(text):
+    codes = to_codes(text)
+    return HEADER.pack(MAGIC, VERSION, len(codes)) + pack_codes(codes)
+
+def unpack(data):
+    count = _read_header(data)
+    return from_codes(unpack_codes(memoryview(data)[HEADER.size:])[:count])
+
+def pack_many(texts):
+    # Records are padded to whole 5-byte groups, so every record can be
+    # packed by the same integer conversion and cut out afterwards.
+    codes = [to_codes(text) for text in batch.as_list(texts)]
+    padded = ''.join(c + "0" * (-len(c) % 8) for c in codes)
+    payloads = batch.split(pack_codes(padded), [packed_size(len(c)) for c in codes])
+    return [HEADER.pack(MAGIC, VERSION, len(c)) + payload for c, payload in zip(codes, payloads)]
+
+def unpack_many(blobs):
+    blobs = batch.as_list(blobs)
+    counts = [_read_header(blob) for blob in blobs]
+    codes = unpack_codes(b"".join(memoryview(blob)[HEADER.size:] for blob in blobs))
+    padded = batch.split(codes, [packed_size(count) // 5 * 8 for count in counts])
+    return [from_codes(c[:count]) for c, count in zip(padded, counts)]
@@ -1,4 +1,9 @@
-import string
+from functools import lru_cache
+from math import isqrt
+
+from . import batch, normalize
+from .alphabet import LATIN
+from .keycache import shared
 
 def to_lowercase(text: str) -> str:
     return text.lower()
@@ -6,78 +11,148 @@ def to_lowercase(text: str) -> str:
 def remove_spaces(text: str) -> str:
     return ''.join(c for c in text if c != ' ')
 
-def digraphs(text: str) -> list[str]:
+def digraphs(text: str, filler: str = 'x', pad: str = 'z') -> list[str]:
     pairs = []
     i = 0
     while i < len(text):
         pair = text[i:i+2]
         if len(pair) == 2 and pair[0] == pair[1]:
-            pairs.append(pair[0] + 'x')
+            pairs.append(pair[0] + filler)
             i += 1
         else:
             if len(pair) == 1:
-                pair += 'z'
+                pair += pad
             pairs.append(pair)
             i += 2
     return pairs
 
-def generate_key_table(key: str) -> list[list[str]]:
-    key = to_lowercase(key).replace('j', 'i')
-    seen = []
-    for c in key:
-        if c not in seen and c in string.ascii_lowercase:
-            seen.append(c)
-    for c in string.ascii_lowercase.replace('j', ''):
-        if c not in seen:
-            seen.append(c)
-    
-    return [seen[i:i+5] for i in range(0, 25, 5)]
+@lru_cache(maxsize=None)
+def grid_symbols(alphabet=LATIN) -> str:
+    symbols = ''.join(alphabet.lower_symbols[i] for i, c in enumerate(alphabet.symbols)
+                      if c not in alphabet.merges)
+    side = isqrt(len(symbols))
+    if side * side != len(symbols):
+        raise ValueError(f"Playfair needs a square alphabet; {alphabet.name} has {len(symbols)} symbols after merges.")
+    return symbols
+
+@lru_cache(maxsize=None)
+def folding(alphabet=LATIN) -> dict:
+    # Maps every accepted spelling of a symbol (either case, merged letters)
+    # onto its grid character and drops spaces.
+    table = {ord(' '): None}
+    for c, i in alphabet.index.items():
+        symbol = alphabet.symbols[i]
+        symbol = alphabet.merges.get(symbol, symbol)
+        table[ord(c)] = alphabet.lower_symbols[alphabet.index[symbol]]
+    return table
+
+@lru_cache(maxsize=None)
+def normalizer(alphabet=LATIN) -> normalize.Normalizer:
+    return normalize.Normalizer(folding(alphabet))
+
+def fillers(symbols: str) -> tuple[str, str]:
+    filler = 'x' if 'x' in symbols else symbols[-1]
+    pad = 'z' if 'z' in symbols else symbols[-2]
+    return filler, pad
+
+def generate_key_table(key: str, alphabet=LATIN) -> list[list[str]]:
+    symbols = grid_symbols(alphabet)
+    seen = dict.fromkeys(c for c in key.translate(folding(alphabet)) if c in symbols)
+    seen.update(dict.fromkeys(symbols))
+    seen = list(seen)
+    side = isqrt(len(symbols))
+
+    return [seen[i:i+side] for i in range(0, len(seen), side)]
 
 def search(matrix: list[list[str]], ch: str) -> tuple[int,int]:
-    for r in range(5):
-        for c in range(5):
-            if matrix[r][c] == ch:
+    for r, row in enumerate(matrix):
+        for c, cell in enumerate(row):
+            if cell == ch:
                 return r, c
     raise ValueError(f"Character {ch!r} not in key table")
 
 def encrypt_pair(matrix, a: str, b: str) -> str:
-    r1, c1 = search(matrix, a)
-    r2, c2 = search(matrix, b)
-    
-    if r1 == r2:
-        return matrix[r1][(c1 + 1) % 5] + matrix[r2][(c2 + 1) % 5]
-    
-    if c1 == c2:
-        return matrix[(r1 + 1) % 5][c1] + matrix[(r2 + 1) % 5][c2]
-    
-    return matrix[r1][c2] + matrix[r2][c1]
+    return _shift_pair(matrix, a, b, 1)
 
 def decrypt_pair(matrix, a: str, b: str) -> str:
+    return _shift_pair(matrix, a, b, -1)
+
+def _shift_pair(matrix, a: str, b: str, step: int) -> str:
+    side = len(matrix)
     r1, c1 = search(matrix, a)
     r2, c2 = search(matrix, b)
-    
+
     if r1 == r2:
-        return matrix[r1][(c1 - 1) % 5] + matrix[r2][(c2 - 1) % 5]
-    
+        return matrix[r1][(c1 + step) % side] + matrix[r2][(c2 + step) % side]
+
     if c1 == c2:
-        return matrix[(r1 - 1) % 5][c1] + matrix[(r2 - 1) % 5][c2]
-    
+        return matrix[(r1 + step) % side][c1] + matrix[(r2 + step) % side][c2]
+
     return matrix[r1][c2] + matrix[r2][c1]
 
-def preprocess(text: str) -> list[str]:
-    
-    t = to_lowercase(text)
-    t = remove_spaces(t).replace('j', 'i')
-    
-    return digraphs(t)
-
-def encrypt(text: str, key: str) -> str:
-    mat = generate_key_table(key)
-    pairs = preprocess(text)
-    return ''.join(encrypt_pair(mat, p[0], p[1]) for p in pairs)
-
-def decrypt(text: str, key: str) -> str:
-    mat = generate_key_table(key)
-    
+class DigraphTable(dict):
+    # Filled on first use: large square alphabets have side**4 digraphs, but
+    # any one text only ever touches a small fraction of them.
+    def __init__(self, matrix, step):
+        super().__init__()
+        self.matrix = matrix
+        self.step = step
+
+    def __missing__(self, pair):
+        result = self[pair] = _shift_pair(self.matrix, pair[0], pair[1], self.step)
+        return result
+
+@shared
+def compile_key(key: str, alphabet=LATIN) -> tuple[DigraphTable, DigraphTable]:
+    matrix = generate_key_table(key, alphabet)
+    return DigraphTable(matrix, 1), DigraphTable(matrix, -1)
+
+def prepare(text: str, alphabet=LATIN, inserted=None) -> str:
+    # Folding and the digraph split are one translate and one regex scan.
+    return normalize.digraph_text(normalizer(alphabet)(text), *fillers(grid_symbols(alphabet)), inserted)
+
+def preprocess(text: str, alphabet=LATIN) -> list[str]:
+    t = prepare(text, alphabet)
+    return [t[i:i+2] for i in range(0, len(t), 2)]
+
+def substitute_pairs(text: str, table: DigraphTable) -> str:
     pairs = [text[i:i+2] for i in range(0, len(text), 2)]
-    return ''.join(decrypt_pair(mat, p[0], p[1]) for p in pairs)
+    return ''.join(map(table.__getitem__, pairs))
+
+def fold_ciphertext(text: str, alphabet=LATIN) -> str:
+    text = normalizer(alphabet)(text)
+    if len(text) % 2:
+        raise ValueError("Playfair ciphertext must have an even number of letters")
+    return text
+
+def encrypt(text: str, key: str, alphabet=LATIN, keep_layout: bool = False) -> str:
+    # With keep_layout, removed spaces are put back at their places in the
+    # ciphertext, after any fillers.
+    table, _ = compile_key(key, alphabet)
+    if not keep_layout:
+        return substitute_pairs(prepare(text, alphabet), table)
+    folded, removed = normalizer(alphabet).with_offsets(text)
+    inserted = []
+    prepared = normalize.digraph_text(folded, *fillers(grid_symbols(alphabet)), inserted)
+    return normalize.restore(substitute_pairs(prepared, table), removed, inserted)
+
+def decrypt(text: str, key: str, alphabet=LATIN, keep_layout: bool = False) -> str:
+    _, table = compile_key(key, alphabet)
+    if not keep_layout:
+        return substitute_pairs(fold_ciphertext(text, alphabet), table)
+    folded, removed = normalizer(alphabet).with_offsets(text)
+    if len(folded) % 2:
+        raise ValueError("Playfair ciphertext must have an even number of letters")
+    return normalize.restore(substitute_pairs(folded, table), removed)
+
+def encrypt_many(texts, key: str, alphabet=LATIN) -> list[str]:
+    # Prepared records always have an even length, so digraphs never
+    # straddle two records in the joined text.
+    table, _ = compile_key(key, alphabet)
+    prepared = [prepare(text, alphabet) for text in texts]
+    return batch.split(substitute_pairs(''.join(prepared), table), map(len, prepared))
+
+def decrypt_many(texts, key: str, alphabet=LATIN) -> list[str]:
+    _, table = compile_key(key, alphabet)
+    prepared = [fold_ciphertext(text, alphabet) for text in texts]
+    return batch.split(substitute_pairs(''.join(prepared), table), map(len, prepared))
@@ -1,99 +1,65 @@
+from operator import itemgetter
+
+from . import batch
+from .keycache import shared
+
+# Permutations hold one index per character, so only those of texts up to
+# CACHED_LENGTH characters are kept in the shared key cache; longer texts
+# (which rarely repeat a length) build theirs on every call.
+CACHED_LENGTH = 4096
+
+
+def build_permutation(length, rails):
+    # Input positions in the order they are read off the fence: rail 0,
+    # then each middle rail alternating down- and up-strokes, then the
+    # bottom rail.
+    cycle = 2 * (rails - 1)
+    order = []
+    for rail in range(rails):
+        down = range(rail, length, cycle)
+        if rail == 0 or rail == rails - 1:
+            order.extend(down)
+            continue
+        up = range(cycle - rail, length, cycle)
+        merged = [0] * (len(down) + len(up))
+        merged[::2] = down
+        merged[1::2] = up
+        order.extend(merged)
+    return itemgetter(*order)
+
+def build_inverse_permutation(length, rails):
+    order = build_permutation(length, rails)(range(length))
+    return itemgetter(*sorted(range(length), key=order.__getitem__))
+
+_cached_permutation = shared(build_permutation)
+_cached_inverse_permutation = shared(build_inverse_permutation)
+
+def permutation(length, rails):
+    if length <= CACHED_LENGTH:
+        return _cached_permutation(length, rails)
+    return build_permutation(length, rails)
+
+def inverse_permutation(length, rails):
+    if length <= CACHED_LENGTH:
+        return _cached_inverse_permutation(length, rails)
+    return build_inverse_permutation(length, rails)
+
 def encrypt(text, key):
-    if not text:
-        return text
-    
     rails = int(key)
-    if rails <= 1:
+    if len(text) < 2 or rails <= 1:
         return text
     
-    
-    fence = [['' for _ in range(len(text))] for _ in range(rails)]
-    
-    
-    direction = True
-    rail = 0
-    
-    
-    for i, char in enumerate(text):
-        fence[rail][i] = char
-        
-        
-        if rail == 0:
-            direction = True
-        elif rail == rails - 1:
-            direction = False
-        
-        
-        if direction:
-            rail += 1
-        else:
-            rail -= 1
-    
-    
-    result = ""
-    for r in range(rails):
-        for c in range(len(text)):
-            if fence[r][c]:
-                result += fence[r][c]
-    
-    return result
+    return ''.join(permutation(len(text), rails)(text))
 
 def decrypt(text, key):
-    if not text:
-        return text
-    
     rails = int(key)
-    if rails <= 1:
+    if len(text) < 2 or rails <= 1:
         return text
     
-    
-    fence = [['' for _ in range(len(text))] for _ in range(rails)]
-    
-    
-    direction = True
-    rail = 0
-    
-    for i in range(len(text)):
-        fence[rail][i] = '*'  
-        
-        
-        if rail == 0:
-            direction = True
-        elif rail == rails - 1:
-            direction = False
-        
-        
-        if direction:
-            rail += 1
-        else:
-            rail -= 1
-    
-    
-    index = 0
-    for r in range(rails):
-        for c in range(len(text)):
-            if fence[r][c] == '*' and index < len(text):
-                fence[r][c] = text[index]
-                index += 1
-    
-    
-    result = ""
-    direction = True
-    rail = 0
-    
-    for i in range(len(text)):
-        result += fence[rail][i]
-        
-        
-        if rail == 0:
-            direction = True
-        elif rail == rails - 1:
-            direction = False
-        
-        
-        if direction:
-            rail += 1
-        else:
-            rail -= 1
-    
-    return result
\ No newline at end of file
+    return ''.join(inverse_permutation(len(text), rails)(text))
+
+def encrypt_many(texts, key):
+    return [encrypt(text, key) for text in batch.as_list(texts)]
+
+def decrypt_many(texts, key):
+    return [decrypt(text, key) for text in batch.as_list(texts)]
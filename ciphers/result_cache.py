@@ -0,0 +1,75 @@
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+INVERSE_MODE = {"encrypt": "decrypt", "decrypt": "encrypt"}
+
+
+def digest(text):
+    data = text.encode("utf-8", "surrogatepass")
+    return len(data), hashlib.blake2b(data, digest_size=16).digest()
+
+
+class ResultCache:
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, cipher, key, mode, text):
+        entry_key = (cipher, key, mode, digest(text))
+        with self._lock:
+            result = self._entries.get(entry_key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(entry_key)
+            self.hits += 1
+            return result
+
+    def put(self, cipher, key, mode, text, result, invertible=False):
+        with self._lock:
+            self._store((cipher, key, mode, digest(text)), result)
+            # Only exact inverses may be stored the other way round: ciphers
+            # that drop spaces or fold case would return the wrong text.
+            if invertible:
+                self._store((cipher, key, INVERSE_MODE[mode], digest(result)), text)
+
+    def _store(self, entry_key, value):
+        size = sys.getsizeof(value)
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(entry_key, None)
+        if old is not None:
+            self.bytes -= sys.getsizeof(old)
+        self._entries[entry_key] = value
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= sys.getsizeof(evicted)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
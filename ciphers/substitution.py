@@ -1,39 +1,29 @@
-def encrypt(text, key):
-    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-    key = key.upper()
-    
-    result = ""
-    for char in text:
-        if char.isalpha():
-            
-            if char.isupper():
-                pos = ord(char) - ord('A')
-                result += key[pos]
-            else:
-                pos = ord(char.upper()) - ord('A')
-                result += key[pos].lower()
-        else:
-            result += char
-    return result
+from . import batch
+from .alphabet import LATIN
+from .keycache import shared
 
-def decrypt(text, key):
-    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-    key = key.upper()
-    
-    
-    reverse_key = [''] * 26
-    for i, char in enumerate(key):
-        reverse_key[ord(char) - ord('A')] = alphabet[i]
-    
-    result = ""
-    for char in text:
-        if char.isalpha():
-            if char.isupper():
-                pos = ord(char) - ord('A')
-                result += reverse_key[pos]
-            else:
-                pos = ord(char.upper()) - ord('A')
-                result += reverse_key[pos].lower()
-        else:
-            result += char
-    return result
\ No newline at end of file
+
+@shared
+def compile_key(key, alphabet=LATIN):
+    if not alphabet.contains(key):
+        raise ValueError(f"Substitution key may only contain {alphabet.noun}.")
+    forward = tuple(alphabet.index[c] for c in key)
+    if len(forward) != alphabet.size or len(set(forward)) != alphabet.size:
+        raise ValueError(f"Substitution key must be {alphabet.size} unique {alphabet.noun}.")
+
+    backward = [0] * alphabet.size
+    for i, j in enumerate(forward):
+        backward[j] = i
+    return alphabet.translation(forward), alphabet.translation(tuple(backward))
+
+def encrypt(text, key, alphabet=LATIN):
+    return text.translate(compile_key(key, alphabet)[0])
+
+def decrypt(text, key, alphabet=LATIN):
+    return text.translate(compile_key(key, alphabet)[1])
+
+def encrypt_many(texts, key, alphabet=LATIN):
+    return batch.translate_many(texts, compile_key(key, alphabet)[0])
+
+def decrypt_many(texts, key, alphabet=LATIN):
+    return batch.translate_many(texts, compile_key(key, alphabet)[1])
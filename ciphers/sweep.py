@@ -0,0 +1,126 @@
+import re
+from itertools import chain
+
+from . import affine, caesar, monoalphabetic, normalize, playfair, rail_fence, substitution, transposition, vigenere
+from .alphabet import LATIN
+
+NUMERIC_CIPHERS = {"caesar", "rail_fence", "transposition"}
+MAX_RAILS = 20
+MAX_KEYS = 10_000
+
+_TSV_ESCAPE = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+class SweepMatrix:
+    # One row per key, all of the same width, stored back to back in a
+    # single string; rows and columns are slices of it.
+    def __init__(self, keys, data, width):
+        self.keys = keys
+        self.data = data
+        self.width = width
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.keys)
+        if not 0 <= index < len(self.keys):
+            raise IndexError("sweep row out of range")
+        return self.data[index * self.width:(index + 1) * self.width]
+
+    def __iter__(self):
+        return (self.data[i:i + self.width] for i in range(0, len(self.keys) * self.width, self.width))
+
+    def items(self):
+        return zip(self.keys, self)
+
+    def column(self, position):
+        # The character at one position under every key.
+        return self.data[position::self.width] if self.width else ""
+
+    def to_tsv(self):
+        # One "key<TAB>row" line per key, with tabs and line breaks inside
+        # rows escaped.
+        return ''.join(f"{key}\t{row.translate(_TSV_ESCAPE)}\n" for key, row in self.items())
+
+
+def default_keys(cipher, alphabet=LATIN):
+    m = alphabet.size
+    if cipher == "caesar":
+        return list(range(m))
+    if cipher == "affine":
+        return [f"{a},{b}" for a in affine.valid_a_values(m) for b in range(m)]
+    if cipher in ("rail_fence", "transposition"):
+        return list(range(2, MAX_RAILS + 1))
+    raise ValueError(f"{cipher} has no default key range; please list the keys to sweep.")
+
+def parse_keys(cipher, spec, alphabet=LATIN):
+    # Numeric keys accept ranges such as "2-10"; Affine pairs are separated
+    # by semicolons or spaces; keywords by commas or spaces.
+    if not spec or not spec.strip():
+        return default_keys(cipher, alphabet)
+    if cipher == "affine":
+        return [token for token in re.split(r"[;\s]+", spec.strip()) if token]
+    tokens = [token for token in re.split(r"[,\s]+", spec.strip()) if token]
+    if cipher not in NUMERIC_CIPHERS:
+        return tokens
+    keys = []
+    for token in tokens:
+        match = re.fullmatch(r"(-?\d+)-(-?\d+)|(-?\d+)", token)
+        if not match:
+            raise ValueError(f"Sweep keys must be numbers or ranges such as 2-10, not {token!r}.")
+        if match.group(3):
+            span = [int(match.group(3))]
+        else:
+            span = range(int(match.group(1)), int(match.group(2)) + 1)
+        if len(keys) + len(span) > MAX_KEYS:
+            raise ValueError(f"A sweep can cover at most {MAX_KEYS:,} keys.")
+        keys.extend(span)
+    return keys
+
+def _tables(cipher, keys, index, alphabet):
+    if cipher == "caesar":
+        return [caesar.compile_key(-k if index else k, alphabet) for k in keys]
+    if cipher == "affine":
+        return [affine.compile_key(*affine.parse_key(k), alphabet)[index] for k in keys]
+    module = monoalphabetic if cipher == "monoalphabetic" else substitution
+    return [module.compile_key(k, alphabet)[index] for k in keys]
+
+def _rows(cipher, text, keys, index, alphabet):
+    if cipher in ("caesar", "affine", "monoalphabetic", "substitution"):
+        # Every key is a single table lookup over the whole text.
+        return ''.join(map(text.translate, _tables(cipher, keys, index, alphabet)))
+    if cipher == "vigenere":
+        return ''.join(vigenere.apply_tables(text, vigenere.compile_key(k, alphabet)[index]) for k in keys)
+    if cipher == "playfair":
+        # Preparing the digraphs does not depend on the key.
+        prepared = playfair.fold_ciphertext(text, alphabet) if index else playfair.prepare(text, alphabet)
+        return ''.join(playfair.substitute_pairs(prepared, playfair.compile_key(k, alphabet)[index]) for k in keys)
+    if cipher == "rail_fence":
+        n = len(text)
+        if n < 2:
+            return text * len(keys)
+        # The input length changes with every edit, so caching these
+        # would only fill the key cache.
+        permute = rail_fence.build_inverse_permutation if index else rail_fence.build_permutation
+        return ''.join(chain.from_iterable(
+            permute(n, k)(text) if k > 1 else text for k in map(int, keys)))
+    if cipher == "transposition":
+        keys = list(map(int, keys))
+        if keys and min(keys) < 2:
+            raise ValueError("Transposition sweep keys must be numbers greater than 1.")
+        if index:
+            return ''.join(transposition.decrypt(text, k) for k in keys)
+        clean = normalize.whitespace()(text)
+        if not clean:
+            return text * len(keys)
+        return ''.join(chain.from_iterable(
+            (clean[col::k] for col in range(k)) for k in keys))
+    raise ValueError(f"Key sweep does not support {cipher!r}.")
+
+def sweep(cipher, text, keys=None, mode="encrypt", alphabet=LATIN):
+    keys = list(default_keys(cipher, alphabet) if keys is None else keys)
+    index = 0 if mode == "encrypt" else 1
+    data = _rows(cipher, text, keys, index, alphabet)
+    return SweepMatrix(keys, data, len(data) // len(keys) if keys else 0)
@@ -1,72 +1,47 @@
-def encrypt(text, key):
-    clean_text = ''.join(text.split())
-    
+from . import batch, normalize
+
+
+def encrypt(text, key, keep_layout=False):
+    # Whitespace is dropped in one translate pass; with keep_layout it is
+    # put back at the same positions of the ciphertext.
+    whitespace = normalize.whitespace()
+    if keep_layout:
+        clean_text, removed = whitespace.with_offsets(text)
+    else:
+        clean_text = whitespace(text)
     
     if not clean_text:
         return text
     
     columns = int(key)
     
-    
-    rows = len(clean_text) // columns
-    if len(clean_text) % columns != 0:
-        rows += 1
-    
-    
-    grid = []
-    for i in range(rows):
-        row = []
-        for j in range(columns):
-            index = i * columns + j
-            if index < len(clean_text):
-                row.append(clean_text[index])
-            else:
-                row.append('')  
-        grid.append(row)
-    
-    
-    result = ""
-    for col in range(columns):
-        for row in range(rows):
-            if grid[row][col]:  
-                result += grid[row][col]
-    
-    return result
+    result = ''.join(clean_text[col::columns] for col in range(columns))
+    return normalize.restore(result, removed) if keep_layout else result
+
+def decrypt(text, key, keep_layout=False):
+    if keep_layout:
+        clean_text, removed = normalize.whitespace().with_offsets(text)
+        return normalize.restore(decrypt(clean_text, key), removed)
 
-def decrypt(text, key):
     if not text:
         return text
     
     columns = int(key)
-    rows = len(text) // columns
-    if len(text) % columns != 0:
-        rows += 1
-    
-    
-    extra_chars = len(text) % columns
-    
-    
-    grid = [['' for _ in range(columns)] for _ in range(rows)]
-    
     
+    # Column c of the grid holds positions c, c + columns, ... of the
+    # plaintext and occupies the next len(range(c, n, columns)) ciphertext
+    # characters.
+    result = list(text)
     index = 0
     for col in range(columns):
-        
-        if col < extra_chars:
-            chars_in_col = rows
-        else:
-            chars_in_col = rows - 1 if extra_chars > 0 else rows
-        
-        for row in range(chars_in_col):
-            if index < len(text):
-                grid[row][col] = text[index]
-                index += 1
-    
-    
-    result = ""
-    for row in range(rows):
-        for col in range(columns):
-            if grid[row][col]:
-                result += grid[row][col]
+        count = len(range(col, len(text), columns))
+        result[col::columns] = text[index:index + count]
+        index += count
     
-    return result
\ No newline at end of file
+    return ''.join(result)
+
+def encrypt_many(texts, key):
+    return [encrypt(text, key) for text in batch.as_list(texts)]
+
+def decrypt_many(texts, key):
+    return [decrypt(text, key) for text in batch.as_list(texts)]
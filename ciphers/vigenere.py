@@ -1,27 +1,51 @@
+from . import batch, caesar
+from .alphabet import LATIN
+from .keycache import shared
+
+
 def repeat_key(text, key):
     key = key.upper()
     return (key * (len(text) // len(key))) + key[:len(text) % len(key)]
 
-def encrypt(text, key):
-    key = repeat_key(text, key)
-    result = ""
-    for i, char in enumerate(text):
-        if char.isalpha():
-            offset = ord('A') if char.isupper() else ord('a')
-            key_char = ord(key[i].upper()) - ord('A')
-            result += chr((ord(char) - offset + key_char) % 26 + offset)
-        else:
-            result += char
-    return result
-
-def decrypt(text, key):
-    key = repeat_key(text, key)
-    result = ""
-    for i, char in enumerate(text):
-        if char.isalpha():
-            offset = ord('A') if char.isupper() else ord('a')
-            key_char = ord(key[i].upper()) - ord('A')
-            result += chr((ord(char) - offset - key_char + 26) % 26 + offset)
-        else:
-            result += char
-    return result
+@shared
+def compile_key(key, alphabet=LATIN):
+    if not key:
+        raise ValueError("Vigenère key must not be empty.")
+    if not alphabet.contains(key):
+        raise ValueError(f"Vigenère key may only contain {alphabet.noun}.")
+
+    shifts = [alphabet.index[c] for c in key]
+    return (tuple(caesar.compile_key(s, alphabet) for s in shifts),
+            tuple(caesar.compile_key(-s, alphabet) for s in shifts))
+
+def apply_tables(text, tables):
+    # The key advances on every character, so each key position owns the
+    # stride text[k::period] and can be translated in a single call.
+    period = len(tables)
+    if period == 1:
+        return text.translate(tables[0])
+    result = list(text)
+    for k, table in enumerate(tables[:len(text)]):
+        result[k::period] = text[k::period].translate(table)
+    return ''.join(result)
+
+def encrypt(text, key, alphabet=LATIN):
+    return apply_tables(text, compile_key(key, alphabet)[0])
+
+def decrypt(text, key, alphabet=LATIN):
+    return apply_tables(text, compile_key(key, alphabet)[1])
+
+def apply_tables_many(texts, tables):
+    # Every record starts at key position 0, so each one is padded to a
+    # whole number of key periods before the records are joined.
+    texts = batch.as_list(texts)
+    period = len(tables)
+    strides = [len(t) + -len(t) % period for t in texts]
+    joined = ''.join(t.ljust(n, '\0') for t, n in zip(texts, strides))
+    return batch.split_strided(apply_tables(joined, tables), strides, map(len, texts))
+
+def encrypt_many(texts, key, alphabet=LATIN):
+    return apply_tables_many(texts, compile_key(key, alphabet)[0])
+
+def decrypt_many(texts, key, alphabet=LATIN):
+    return apply_tables_many(texts, compile_key(key, alphabet)[1])
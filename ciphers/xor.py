@@ -0,0 +1,91 @@
+import mmap
+import os
+import random
+
+from . import batch
+
+SEED_PREFIX = "seed:"
+CHUNK_BYTES = 4 * 1024 * 1024
+
+
+class Keystream:
+    # Either the UTF-8 bytes of the key repeated, or a pseudo-random stream
+    # seeded by a "seed:<int>" key. Consecutive reads continue the stream.
+    # Seeded streams are drawn in whole 32-bit words, so any read is a prefix
+    # of a longer one; reads other than the last must be multiples of 4.
+    def __init__(self, key):
+        if key.startswith(SEED_PREFIX):
+            self._random = random.Random(int(key[len(SEED_PREFIX):]))
+        elif key:
+            self._random = None
+            self._key = key.encode("utf-8")
+            self._phase = 0
+        else:
+            raise ValueError("XOR key must not be empty.")
+
+    def read(self, n):
+        if self._random:
+            return self._random.randbytes((n + 3) // 4 * 4)[:n]
+        key, start = self._key, self._phase
+        self._phase = (start + n) % len(key)
+        return (key * ((start + n) // len(key) + 1))[start:start + n]
+
+
+def xor_bytes(data, stream):
+    # Both buffers become one integer each, so the XOR runs over machine
+    # words in C rather than byte by byte.
+    return (int.from_bytes(data, "little") ^ int.from_bytes(stream, "little")).to_bytes(len(data), "little")
+
+def encrypt(data, key):
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return xor_bytes(data, Keystream(key).read(len(data)))
+
+def decrypt(data, key):
+    return encrypt(data, key)
+
+def encrypt_many(texts, key):
+    # Every record starts at the beginning of the keystream.
+    records = [t.encode("utf-8") if isinstance(t, str) else bytes(t) for t in batch.as_list(texts)]
+    lengths = [len(r) for r in records]
+    stream = Keystream(key).read(max(lengths, default=0))
+    joined = xor_bytes(b"".join(records), b"".join(stream[:n] for n in lengths))
+    return batch.split(joined, lengths)
+
+def decrypt_many(texts, key):
+    return encrypt_many(texts, key)
+
+def encrypt_hex(text, key):
+    return encrypt(text, key).hex()
+
+def decrypt_hex(text, key):
+    try:
+        data = bytes.fromhex(text)
+    except ValueError:
+        raise ValueError("XOR ciphertext must be hexadecimal bytes.")
+    return decrypt(data, key).decode("utf-8", "replace")
+
+def xor_file(source, target, key, chunk_size=CHUNK_BYTES, progress=None, cancel=None):
+    # Streams the memory-mapped source through the keystream into a
+    # temporary file that replaces the target only once it is complete.
+    if chunk_size % 4:
+        raise ValueError("Chunk size must be a multiple of 4 bytes.")
+    size = os.path.getsize(source)
+    stream = Keystream(key)
+    tmp_path = target + ".tmp"
+    try:
+        with open(source, "rb") as f, open(tmp_path, "wb") as out:
+            if size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    for offset in range(0, size, chunk_size):
+                        if cancel is not None and cancel.is_set():
+                            return False
+                        chunk = mapped[offset:offset + chunk_size]
+                        out.write(xor_bytes(chunk, stream.read(len(chunk))))
+                        if progress:
+                            progress(offset + len(chunk), size)
+        os.replace(tmp_path, target)
+        return True
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
@@ -0,0 +1,398 @@
+import argparse
+import codecs
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import sys
+from bisect import bisect_right
+
+from ciphers import normalize, playfair, vigenere
+from ciphers.alphabet import LATIN
+from ciphers.compare import CIPHERS
+from validation import DEFAULT_KEYS, validate_key
+
+CHUNK_BYTES = 4 * 1024 * 1024
+CHECKPOINT_VERSION = 1
+
+# Ciphers that map every character on its own; a chunk needs no state.
+STATELESS_CIPHERS = {"Caesar", "Monoalphabetic", "Substitution", "Affine"}
+# Ciphers whose output at one position can come from anywhere in the
+# input; they are resumed over ranges of output positions instead.
+PERMUTATION_CIPHERS = {"Rail Fence", "Transposition"}
+JOB_CIPHERS = sorted(STATELESS_CIPHERS | PERMUTATION_CIPHERS | {"Vigenère", "Playfair"})
+
+# The scratch file of a permutation job holds one 4-byte code point per
+# character, so any position can be read with a memoryview cast to "I".
+UTF32 = "utf-32-le" if sys.byteorder == "little" else "utf-32-be"
+
+
+class StatelessStream:
+    state = None
+
+    def __init__(self, fn, key):
+        self.fn = fn
+        self.key = key
+
+    def __call__(self, text):
+        return self.fn(text, self.key)
+
+    def finish(self):
+        return ""
+
+
+class VigenereStream:
+    # state is the key position of the next character.
+    def __init__(self, key, mode, state=None):
+        self.tables = vigenere.compile_key(key)[mode == "decrypt"]
+        self.state = state or 0
+
+    def __call__(self, text):
+        phase = self.state
+        result = vigenere.apply_tables(text, self.tables[phase:] + self.tables[:phase])
+        self.state = (phase + len(text)) % len(self.tables)
+        return result
+
+    def finish(self):
+        return ""
+
+
+class PlayfairStream:
+    # state is a letter whose partner is in the next chunk: a lone last
+    # letter may still pair up (or turn out to be doubled) once more text
+    # arrives.
+    def __init__(self, key, mode, state=None):
+        self.decrypting = mode == "decrypt"
+        self.table = playfair.compile_key(key)[self.decrypting]
+        self.fold = playfair.normalizer()
+        self.filler, self.pad = playfair.fillers(playfair.grid_symbols(LATIN))
+        self.state = state or ""
+
+    def __call__(self, text):
+        text = self.state + self.fold(text)
+        if self.decrypting:
+            self.state = text[len(text) - len(text) % 2:]
+            text = text[:len(text) - len(self.state)]
+        else:
+            inserted = []
+            prepared = normalize.digraph_text(text, self.filler, self.pad, inserted)
+            # Only a lone last letter gets its filler at the very end.
+            lone = bool(inserted) and inserted[-1] == len(text)
+            self.state = text[-1] if lone else ""
+            text = prepared[:-2] if lone else prepared
+        return playfair.substitute_pairs(text, self.table)
+
+    def finish(self):
+        if not self.state:
+            return ""
+        if self.decrypting:
+            raise ValueError("Playfair ciphertext must have an even number of letters")
+        return playfair.substitute_pairs(self.state + self.pad, self.table)
+
+
+def stream_for(cipher, key, mode, state=None):
+    if cipher == "Vigenère":
+        return VigenereStream(key, mode, state)
+    if cipher == "Playfair":
+        return PlayfairStream(key, mode, state)
+    return StatelessStream(getattr(CIPHERS[cipher], mode), key)
+
+
+def _starts(lengths):
+    starts = [0]
+    for length in lengths[:-1]:
+        starts.append(starts[-1] + length)
+    return starts
+
+def _runs(starts, lengths, a, b):
+    # (group, first index within the group, output position, count) for
+    # every group of consecutive output positions overlapping [a, b).
+    group = bisect_right(starts, a) - 1
+    while group < len(starts) and starts[group] < b:
+        lo = max(a, starts[group])
+        hi = min(b, starts[group] + lengths[group])
+        if lo < hi:
+            yield group, lo - starts[group], lo, hi - lo
+        group += 1
+
+
+class Permutation:
+    # Describes output[a:b] as strided copies out of the input, each one a
+    # (destination, destination step, source, source step, count) tuple
+    # relative to a; no table of n positions is ever built.
+    def __init__(self, cipher, key, mode, n):
+        self.n = n
+        self.decrypting = mode == "decrypt"
+        self.width = int(key)
+        # With at least as many rails or columns as characters, each one
+        # holds a single character, in input order.
+        self.identity = self.width < 2 or self.width >= n
+        if self.identity:
+            self.cycle, self.lengths = 1, []
+        elif cipher == "Transposition":
+            self.cycle = self.width
+            self.lengths = [len(range(c, n, self.width)) for c in range(self.width)]
+        else:
+            # Each middle rail takes a down-stroke and an up-stroke per cycle.
+            self.cycle = 2 * (self.width - 1)
+            self.lengths = [
+                len(range(r, n, self.cycle)) + (len(range(self.cycle - r, n, self.cycle)) if 0 < r < self.width - 1 else 0)
+                for r in range(self.width)
+            ]
+        self.rail_fence = cipher == "Rail Fence"
+        self.starts = _starts(self.lengths)
+
+    def copies(self, a, b):
+        if self.identity:
+            return [(0, 1, a, 1, b - a)]
+        if self.decrypting:
+            return list(self._gather(a, b))
+        return list(self._read_off(a, b))
+
+    def _middle(self, row):
+        return self.rail_fence and 0 < row < self.width - 1
+
+    def _read_off(self, a, b):
+        # Encryption writes rows (columns, or rails) one after another.
+        for row, first, position, count in _runs(self.starts, self.lengths, a, b):
+            dest = position - a
+            if not self._middle(row):
+                yield dest, 1, row + first * self.cycle, self.cycle, count
+                continue
+            # Down-strokes sit at even places of a middle rail, up-strokes
+            # at odd ones.
+            for parity, offset in ((0, row), (1, self.cycle - row)):
+                skip = (parity - first) % 2
+                if skip < count:
+                    place = first + skip
+                    yield dest + skip, 2, offset + place // 2 * self.cycle, self.cycle, len(range(skip, count, 2))
+
+    def _gather(self, a, b):
+        # Decryption fills plaintext positions a..b-1, taking every
+        # position of one residue modulo the cycle in one copy.
+        for position in range(a, min(b, a + self.cycle)):
+            residue = position % self.cycle
+            turn = position // self.cycle
+            count = len(range(position, b, self.cycle))
+            if residue < self.width:
+                row = residue
+                source = self.starts[row] + (2 * turn if self._middle(row) else turn)
+            else:
+                row = self.cycle - residue
+                source = self.starts[row] + 2 * turn + 1
+            yield position - a, self.cycle, source, 2 if self._middle(row) else 1, count
+
+
+def _span(start, step, count):
+    return slice(start, start + step * (count - 1) + 1, step)
+
+
+class Checkpoint:
+    # Progress of one job, kept next to its target. It is only ever
+    # replaced whole, after the output it describes has reached the disk,
+    # so a run killed at any point resumes from a consistent state.
+    def __init__(self, path, identity):
+        self.path = path
+        self.identity = identity
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return saved if saved.get("job") == self.identity else None
+
+    def save(self, *files, **progress):
+        for f in files:
+            f.flush()
+            os.fsync(f.fileno())
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"job": self.identity, **progress}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def job_checkpoint(source, target, cipher, key, mode):
+    stat = os.stat(source)
+    identity = {
+        "version": CHECKPOINT_VERSION,
+        "source": os.path.abspath(source),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "cipher": cipher,
+        "mode": mode,
+        "key": hashlib.sha256(str(key).encode("utf-8")).hexdigest(),
+    }
+    return Checkpoint(target + ".ckpt", identity)
+
+
+def _open_resumed(path, length):
+    # The file cut back to the length the checkpoint vouches for; anything
+    # written after that checkpoint is written again.
+    f = open(path, "r+b" if length else "wb")
+    f.truncate(length)
+    f.seek(length)
+    return f
+
+def _decode_chunks(source, offset, chunk_size):
+    # (text, offset after the text) pairs. Offsets always fall between
+    # characters: bytes of a character cut by the chunk end are read again
+    # with the next chunk.
+    size = os.path.getsize(source)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    with open(source, "rb") as f:
+        f.seek(offset)
+        position = offset
+        while position < size:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                raise ValueError("The source file shrank while it was being read.")
+            position += len(chunk)
+            text = decoder.decode(chunk, final=position >= size)
+            yield text, position - len(decoder.getstate()[0])
+
+
+def _files_intact(part, saved):
+    # Every file the checkpoint counts bytes in must still hold at least
+    # that many.
+    def holds(path, length):
+        return not length or (os.path.exists(path) and os.path.getsize(path) >= length)
+    if saved.get("stage") in ("read", "write") and not holds(part + ".u32", saved.get("chars", 0) * 4):
+        return False
+    return saved.get("stage") == "read" or holds(part, saved.get("written", 0))
+
+
+def _run_stream(source, part, cipher, key, mode, checkpoint, saved, chunk_size, progress, cancel):
+    size = os.path.getsize(source)
+    stream = stream_for(cipher, key, mode, saved.get("state"))
+    written = saved.get("written", 0)
+    with _open_resumed(part, written) as out:
+        for text, offset in _decode_chunks(source, saved.get("offset", 0), chunk_size):
+            if cancel is not None and cancel.is_set():
+                return False
+            written += out.write(stream(text).encode("utf-8"))
+            checkpoint.save(out, stage="stream", offset=offset, written=written, state=stream.state)
+            if progress:
+                progress(offset, size)
+        out.write(stream.finish().encode("utf-8"))
+    return True
+
+
+def _run_permutation(source, part, cipher, key, mode, checkpoint, saved, chunk_size, progress, cancel):
+    # First the input is copied into the fixed-width scratch file (minus
+    # whitespace for Transposition encryption), then the output is filled
+    # in ranges of positions; both steps are checkpointed.
+    size = os.path.getsize(source)
+    scratch = part + ".u32"
+    strip = normalize.whitespace() if cipher == "Transposition" and mode == "encrypt" else None
+    chars = saved.get("chars", 0)
+    if saved.get("stage", "read") == "read":
+        with _open_resumed(scratch, chars * 4) as out:
+            for text, offset in _decode_chunks(source, saved.get("offset", 0), chunk_size):
+                if cancel is not None and cancel.is_set():
+                    return False
+                if strip:
+                    text = strip(text)
+                out.write(text.encode(UTF32))
+                chars += len(text)
+                checkpoint.save(out, stage="read", offset=offset, chars=chars)
+                if progress:
+                    progress(offset, 2 * size)
+        saved = {}
+        checkpoint.save(stage="write", chars=chars, position=0, written=0)
+
+    if chars == 0:
+        # An input of nothing but whitespace comes back as it is.
+        shutil.copyfile(source, part)
+        return True
+
+    permutation = Permutation(cipher, key, mode, chars)
+    block_chars = max(1, chunk_size // 4)
+    position = saved.get("position", 0)
+    written = saved.get("written", 0)
+    with open(scratch, "rb") as f, _open_resumed(part, written) as out, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        with memoryview(mapped) as raw, raw.cast("I") as text:
+            while position < chars:
+                if cancel is not None and cancel.is_set():
+                    return False
+                end = min(chars, position + block_chars)
+                block = memoryview(bytearray(4 * (end - position))).cast("I")
+                for dest, dest_step, src, src_step, count in permutation.copies(position, end):
+                    block[_span(dest, dest_step, count)] = text[_span(src, src_step, count)]
+                written += out.write(block.tobytes().decode(UTF32).encode("utf-8"))
+                position = end
+                checkpoint.save(out, stage="write", chars=chars, position=position, written=written)
+                if progress:
+                    progress(size + size * position // chars, 2 * size)
+    return True
+
+
+def run_job(source, target, cipher, key, mode="encrypt", chunk_size=CHUNK_BYTES, progress=None, cancel=None):
+    # Encrypts or decrypts the file as it is (no stripping, unlike the
+    # editor) into target, with the same bytes as a single call on the
+    # whole text would give. Work goes to target.part; a checkpoint in
+    # target.ckpt lets a later call with the same arguments carry on
+    # where a killed or cancelled run stopped. Returns False if cancelled.
+    if cipher not in JOB_CIPHERS:
+        raise ValueError(f"Unknown cipher {cipher!r}; choose from {', '.join(JOB_CIPHERS)}.")
+    if chunk_size < 4:
+        raise ValueError("Chunk size must be at least 4 bytes.")
+    part = target + ".part"
+    checkpoint = job_checkpoint(source, target, cipher, key, mode)
+    saved = checkpoint.load() or {}
+    if saved and not _files_intact(part, saved):
+        saved = {}
+    run = _run_permutation if cipher in PERMUTATION_CIPHERS else _run_stream
+    if not run(source, part, cipher, key, mode, checkpoint, saved, chunk_size, progress, cancel):
+        return False
+    os.replace(part, target)
+    if os.path.exists(part + ".u32"):
+        os.remove(part + ".u32")
+    checkpoint.clear()
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Encrypt or decrypt a large file in checkpointed chunks.")
+    parser.add_argument("source")
+    parser.add_argument("target")
+    parser.add_argument("--cipher", default="Caesar", choices=JOB_CIPHERS)
+    parser.add_argument("--key", help="cipher key (default: the app's default key for the cipher)")
+    parser.add_argument("--mode", default="encrypt", choices=["encrypt", "decrypt"])
+    parser.add_argument("--chunk-mb", type=float, default=CHUNK_BYTES / 1024 / 1024,
+                        help="work done between checkpoints")
+    args = parser.parse_args(argv)
+
+    try:
+        key = validate_key(args.cipher, DEFAULT_KEYS[args.cipher] if args.key is None else args.key)
+    except ValueError as e:
+        parser.error(str(e))
+
+    def report(done, total):
+        print(f"\r{done / total:6.1%}", end="", file=sys.stderr, flush=True)
+
+    try:
+        if job_checkpoint(args.source, args.target, args.cipher, key, args.mode).load():
+            print(f"Resuming from the checkpoint in {args.target}.ckpt", file=sys.stderr)
+        run_job(args.source, args.target, args.cipher, key, args.mode,
+                max(4, int(args.chunk_mb * 1024 * 1024)), report)
+    except KeyboardInterrupt:
+        print("\nStopped; run the same command again to resume.", file=sys.stderr)
+        sys.exit(130)
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        print(f"\n{e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"\nWrote {args.target}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
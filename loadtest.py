@@ -0,0 +1,165 @@
+import argparse
+import statistics
+import threading
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import main as app
+from ciphers.keycache import KEY_CACHE
+
+# Letters and spaces only, so every cipher (Playfair included) takes its
+# normal path rather than the error path.
+SAMPLE_TEXT = "The quick brown fox jumps over the lazy dog "
+
+
+class HeadlessPage:
+    # Just enough of ft.Page for main() to build a session with no client
+    # attached: updates are counted instead of sent.
+    def __init__(self, width=900, height=700):
+        self.width = width
+        self.height = height
+        self.overlay = []
+        self.controls = []
+        self.updates = 0
+
+    def add(self, *controls):
+        self.controls.extend(controls)
+
+    def update(self, *controls):
+        self.updates += 1
+
+    def run_thread(self, handler, *args):
+        threading.Thread(target=handler, args=args, daemon=True).start()
+
+
+def children(control):
+    for name in ("content", "controls"):
+        value = getattr(control, name, None)
+        if isinstance(value, list):
+            yield from value
+        elif value is not None:
+            yield value
+
+def find_control(roots, predicate):
+    stack = list(roots)
+    while stack:
+        control = stack.pop()
+        if predicate(control):
+            return control
+        stack.extend(children(control))
+    return None
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_session(cipher, text, interval, start, result):
+    try:
+        type_into_session(cipher, text, interval, start, result)
+    except BaseException as e:
+        result["error"] = e
+        start.abort()
+
+
+def type_into_session(cipher, text, interval, start, result):
+    page = HeadlessPage()
+    started = time.perf_counter()
+    app.main(page)
+    tabs = page.controls[1].content
+    tabs.selected_index = [tab.text for tab in tabs.tabs].index(cipher)
+    tabs.on_change(SimpleNamespace(control=tabs))
+    result["build"] = time.perf_counter() - started
+
+    field = find_control(page.controls, lambda c: getattr(c, "label", None) == "Input Text")
+    output = find_control(page.controls, lambda c: getattr(c, "label", None) == "Output")
+    latencies = result["latencies"] = []
+    start.wait()
+    for i in range(1, len(text) + 1):
+        field.value = text[:i]
+        started = time.perf_counter()
+        field.on_change(SimpleNamespace(control=field, data=field.value))
+        latencies.append(time.perf_counter() - started)
+        if (output.value or "").startswith("Error:"):
+            raise RuntimeError(f"{cipher} failed after {i} characters: {output.value}")
+        if interval:
+            time.sleep(interval)
+    result["updates"] = page.updates
+    result["memory"] = page.session_memory.report()
+
+
+def load_test(sessions, cipher="Playfair", chars=200, interval=0.0, trace_memory=True):
+    text = (SAMPLE_TEXT * (chars // len(SAMPLE_TEXT) + 1))[:chars]
+    if trace_memory:
+        tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0] if trace_memory else 0
+
+    start = threading.Barrier(sessions + 1)
+    results = [{} for _ in range(sessions)]
+    threads = [
+        threading.Thread(target=run_session, args=(cipher, text, interval, start, result))
+        for result in results
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        start.wait()
+    except threading.BrokenBarrierError:
+        pass
+    typing_started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - typing_started
+    errors = [r["error"] for r in results if "error" in r]
+    if errors:
+        raise next((e for e in errors if not isinstance(e, threading.BrokenBarrierError)), errors[0])
+
+    traced = tracemalloc.get_traced_memory()[0] - baseline if trace_memory else None
+    if trace_memory:
+        tracemalloc.stop()
+    latencies = [latency for result in results for latency in result.get("latencies", ())]
+    return {
+        "sessions": sessions,
+        "cipher": cipher,
+        "keystrokes": len(latencies),
+        "seconds": elapsed,
+        "build_ms": statistics.mean(r["build"] for r in results) * 1000,
+        "latency_p50_ms": percentile(latencies, 0.5) * 1000,
+        "latency_p95_ms": percentile(latencies, 0.95) * 1000,
+        "latency_max_ms": max(latencies) * 1000,
+        "updates_per_session": statistics.mean(r["updates"] for r in results),
+        "accounted_bytes_per_session": statistics.mean(r["memory"]["total"] for r in results),
+        "traced_bytes_per_session": traced / sessions if trace_memory else None,
+        "key_cache": KEY_CACHE.stats(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate concurrent sessions typing into the cipher app.")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--cipher", default="Playfair")
+    parser.add_argument("--chars", type=int, default=200, help="characters typed per session")
+    parser.add_argument("--interval", type=float, default=0.0, help="seconds between keystrokes")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="skip memory tracing, which slows Python down")
+    args = parser.parse_args(argv)
+
+    try:
+        report = load_test(args.sessions, args.cipher, args.chars, args.interval, not args.no_tracemalloc)
+    except RuntimeError as e:
+        parser.exit(1, f"{parser.prog}: {e}\n")
+    print(f"{report['sessions']} sessions × {args.chars} keystrokes on {report['cipher']} "
+          f"in {report['seconds']:.2f} s ({report['keystrokes'] / report['seconds']:,.0f} keystrokes/s)")
+    print(f"session build: {report['build_ms']:.1f} ms")
+    print(f"keystroke latency: p50 {report['latency_p50_ms']:.2f} ms, "
+          f"p95 {report['latency_p95_ms']:.2f} ms, max {report['latency_max_ms']:.2f} ms")
+    print(f"updates per session: {report['updates_per_session']:.0f}")
+    print(f"memory per session: {report['accounted_bytes_per_session'] / 1024:.1f} KiB accounted", end="")
+    if report["traced_bytes_per_session"] is not None:
+        print(f", {report['traced_bytes_per_session'] / 1024:.1f} KiB traced", end="")
+    print()
+    print(f"shared key cache: {report['key_cache']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,141 +1,214 @@
+import codecs
 import os
-import re
+import string
+import sys
+import threading
+import time
+import perf
 import flet as ft
-from ciphers import playfair, monoalphabetic, caesar, vigenere, substitution, transposition, rail_fence, affine
-
-class CipherValidator:    
-    @staticmethod
-    def validate_text_input(text):
-        if not text or not text.strip():
-            raise ValueError("Please enter the text to process.")
-        return text.strip()
-    
-    @staticmethod
-    def validate_caesar_key(key):
-        if not key or not key.strip():
-            raise ValueError("Please enter a key.")
-        
-        try:
-            shift = int(key.strip())
-            if shift < -25 or shift > 25:
-                raise ValueError("Caesar cipher key must be a number between -25 and 25.")
-            return shift
-        except ValueError as e:
-            if "invalid literal" in str(e):
-                raise ValueError("Caesar cipher key must be a number between -25 and 25.")
-            raise
-    
-    @staticmethod
-    def validate_vigenere_key(key):
-        if not key or not key.strip():
-            raise ValueError("Please enter a key.")
-        
-        key = key.strip()
-        if not re.match(r'^[A-Za-z]+$', key):
-            raise ValueError("Vigenère cipher key must contain only letters.")
-        return key
-    
-    @staticmethod
-    def validate_playfair_key(key):
-        if not key or not key.strip():
-            raise ValueError("Please enter a key.")
-        
-        key = key.strip()
-        if not re.match(r'^[A-Za-z]+$', key):
-            raise ValueError("Playfair cipher key must contain only letters.")
-        return key
-    
-    @staticmethod
-    def validate_monoalphabetic_key(key):
-        if not key or not key.strip():
-            return "QWERTYUIOPLKJHGFDSAZXCVBNM"
-        
-        key = key.strip().upper()
-        
-        if not re.match(r'^[A-Za-z]+$', key):
-            raise ValueError("The substitution key must be exactly 26 unique letters.")
-        
-        if len(key) != 26:
-            raise ValueError("The substitution key must be exactly 26 unique letters.")
-        
-        if len(set(key)) != 26:
-            raise ValueError("The substitution key must be exactly 26 unique letters.")
-        
-        return key
-    
-    @staticmethod
-    def validate_rail_fence_key(key):
-        if not key or not key.strip():
-            raise ValueError("Please enter a key.")
-        
-        try:
-            rails = int(key.strip())
-            if rails < 2:
-                raise ValueError("Rail fence cipher key must be a number greater than 1.")
-            return rails
-        except ValueError as e:
-            if "invalid literal" in str(e):
-                raise ValueError("Rail fence cipher key must be a number greater than 1.")
-            raise
-    
-    @staticmethod
-    def validate_transposition_key(key):
-        if not key or not key.strip():
-            raise ValueError("Please enter a key.")
-        
-        try:
-            columns = int(key.strip())
-            if columns < 2:
-                raise ValueError("Transposition cipher key must be a number greater than 1.")
-            return columns
-        except ValueError as e:
-            if "invalid literal" in str(e):
-                raise ValueError("Transposition cipher key must be a number greater than 1.")
-            raise
-    
-    @staticmethod
-    def validate_affine_key(key):
-        if not key or not key.strip():
-            raise ValueError("Please enter a key.")
-        
-        key = key.strip()
-        
-        if not re.match(r'^\d+,\d+$', key):
-            raise ValueError("Affine cipher key must be in format 'a,b' (e.g., '5,8').")
-        
-        try:
-            a, b = map(int, key.split(','))
-            
-            valid_a_values = [1, 3, 5, 7, 9, 11, 15, 17, 19, 21, 23, 25]
-            if a not in valid_a_values:
-                raise ValueError("The 'a' value must be coprime with 26.")
-            
-            return key
-        except ValueError as e:
-            if "invalid literal" in str(e):
-                raise ValueError("Affine cipher key must be in format 'a,b' (e.g., '5,8').")
-            raise
-    
-    @staticmethod
-    def validate_substitution_key(key):
-        if not key or not key.strip():
-            raise ValueError("Please enter a key.")
-        
-        key = key.strip()
-        
-        if len(key) != 26:
-            raise ValueError("Substitution cipher key must be 26 unique letters.")
-        
-        if not re.match(r'^[A-Za-z]+$', key):
-            raise ValueError("Substitution cipher key must be 26 unique letters.")
-        
-        if len(set(key.lower())) != 26:
-            raise ValueError("Substitution cipher key must be 26 unique letters.")
-        
-        return key.upper()
+from ciphers import playfair, monoalphabetic, caesar, vigenere, substitution, transposition, rail_fence, affine, packed, xor, sweep, compare
+from ciphers.analysis import LetterCounts
+from ciphers.keycache import KEY_CACHE
+from ciphers.result_cache import ResultCache
+from validation import CipherValidator, DEFAULT_KEYS, validate_key
+
+ERROR_SNACKBAR_THROTTLE = 1.5
+
+# Every session has its own result cache; compiled keys are shared by all
+# sessions in the process (ciphers.keycache).
+RESULT_CACHE_BYTES = int(os.environ.get("CIPHER_APP_RESULT_CACHE_BYTES", 32 * 1024 * 1024))
+
+# Ciphers whose decrypt exactly undoes encrypt (and vice versa) under the
+# Latin alphabet, so a result can be cached for the opposite mode as well.
+INVERTIBLE_CIPHERS = {"Caesar", "Vigenère", "Substitution", "Rail Fence", "Affine"}
+
+# Texts longer than this are shown in a PagedTextView instead of a TextField,
+# which would send and lay out the whole document at once. It shows
+# PAGE_LINES lines per page and keeps at most WINDOW_PAGES pages loaded.
+LARGE_TEXT_THRESHOLD = 200_000
+PAGE_LINES = 200
+LINE_CHARS = 200
+WINDOW_PAGES = 3
+
+# Files are read in LOAD_CHUNK_BYTES pieces; anything past
+# MAX_UPLOAD_BYTES is left out of the editor.
+LOAD_CHUNK_BYTES = 1024 * 1024
+MAX_UPLOAD_BYTES = int(os.environ.get("CIPHER_APP_MAX_UPLOAD_BYTES", 64 * 1024 * 1024))
+
+# Ciphers that work character by character, so a file can be encrypted
+# chunk by chunk while it is still being read.
+STREAMING_CIPHERS = {"Caesar", "Vigenère", "Monoalphabetic", "Substitution", "Affine"}
+
+HISTOGRAM_HEIGHT = 80
+
+# Key sweeps run on at most SWEEP_TEXT_LIMIT characters of the input.
+SWEEP_CIPHERS = {
+    "Playfair": "playfair", "Monoalphabetic": "monoalphabetic", "Caesar": "caesar",
+    "Vigenère": "vigenere", "Substitution": "substitution", "Rail Fence": "rail_fence",
+    "Transposition": "transposition", "Affine": "affine",
+}
+SWEEP_TEXT_LIMIT = 4096
+
+
+class PagedTextView:
+    def __init__(self, page, label, on_clear=None):
+        self.page = page
+        self.text = ""
+        self.position = 0
+        self.status = ft.Text(size=12)
+        self.list_view = ft.ListView(
+            height=400,
+            spacing=0,
+            on_scroll=self.on_scroll,
+            on_scroll_interval=100,
+        )
+        header = [ft.Text(label, weight="w500", expand=True), self.status]
+        if on_clear:
+            header.append(ft.IconButton(
+                icon=ft.Icons.CLOSE,
+                tooltip="Clear document",
+                on_click=lambda _: on_clear(),
+            ))
+        self.control = ft.Container(
+            content=ft.Column([ft.Row(header), self.list_view], spacing=5),
+            padding=10,
+            border_radius=10,
+            border=ft.border.all(1, ft.Colors.OUTLINE),
+        )
+
+    def set_text(self, text):
+        self.text = text
+        # Start offsets of every page found so far; page i spans
+        # page_starts[i]:page_starts[i + 1]. Only the pages first..last-1
+        # are on the client at any time.
+        self.page_starts = [0]
+        self.first = 0
+        self.last = 0
+        self.list_view.controls = []
+        self.load_next_page()
+
+    def read_page(self, index):
+        text = self.text
+        position = self.page_starts[index]
+        lines = []
+        while position < len(text) and len(lines) < PAGE_LINES:
+            end = text.find("\n", position, position + LINE_CHARS + 1)
+            if end == -1:
+                end = min(position + LINE_CHARS, len(text))
+                next_position = end
+            else:
+                next_position = end + 1
+            lines.append(text[position:end])
+            position = next_position
+        if index + 1 == len(self.page_starts):
+            self.page_starts.append(position)
+        return [
+            ft.Text(line, selectable=True, font_family="monospace", size=14, key=f"{index}:{n}")
+            for n, line in enumerate(lines)
+        ]
+
+    def has_next_page(self):
+        return self.last < len(self.page_starts) and self.page_starts[self.last] < len(self.text)
+
+    def load_next_page(self):
+        # Returns the key of the line to keep in view when a page was
+        # dropped from the top, else None.
+        controls = self.list_view.controls
+        lines_before = len(controls)
+        controls.extend(self.read_page(self.last))
+        self.last += 1
+        anchor = None
+        if self.last - self.first > WINDOW_PAGES:
+            anchor = controls[lines_before - 1].key if lines_before else None
+            del controls[:self.page_length(self.first)]
+            self.first += 1
+        self.show_status()
+        return anchor
+
+    def load_previous_page(self):
+        controls = self.list_view.controls
+        anchor = controls[0].key if controls else None
+        self.first -= 1
+        controls[:0] = self.read_page(self.first)
+        if self.last - self.first > WINDOW_PAGES:
+            self.last -= 1
+            del controls[len(controls) - self.page_length(self.last):]
+        self.show_status()
+        return anchor
+
+    def page_length(self, index):
+        return sum(1 for control in self.list_view.controls if control.key.startswith(f"{index}:"))
+
+    def show_status(self):
+        start = self.page_starts[self.first]
+        end = self.page_starts[self.last] if self.last < len(self.page_starts) else len(self.text)
+        self.status.value = f"Showing characters {start:,}–{end:,} of {len(self.text):,}"
+
+    def on_scroll(self, e):
+        # The list holds at most WINDOW_PAGES pages: pages that scroll off
+        # one end are dropped and read again from the text when the user
+        # scrolls back, so the client never holds the whole document.
+        if e.pixels >= e.max_scroll_extent - 200 and self.has_next_page():
+            anchor = self.load_next_page()
+        elif e.pixels <= 200 and self.first > 0:
+            anchor = self.load_previous_page()
+        else:
+            return
+        self.page.update(self.control)
+        if anchor:
+            self.list_view.scroll_to(key=anchor, duration=0)
+
+
+class LetterHistogram:
+    def __init__(self, title):
+        self.bars = [
+            ft.Container(width=10, height=0, bgcolor=ft.Colors.PRIMARY, border_radius=2, tooltip=letter)
+            for letter in string.ascii_uppercase
+        ]
+        self.summary = ft.Text(size=12)
+        self.control = ft.Column([
+            ft.Text(title, weight="w500"),
+            ft.Row([
+                ft.Column([bar, ft.Text(letter, size=10)], spacing=2,
+                          alignment=ft.MainAxisAlignment.END,
+                          horizontal_alignment=ft.CrossAxisAlignment.CENTER)
+                for bar, letter in zip(self.bars, string.ascii_uppercase)
+            ], spacing=2, height=HISTOGRAM_HEIGHT + 20, vertical_alignment=ft.CrossAxisAlignment.END),
+            self.summary,
+        ], spacing=5)
+
+    def show(self, letter_counts):
+        counts = letter_counts.counts
+        peak = max(counts) or 1
+        for bar, letter, count in zip(self.bars, string.ascii_uppercase, counts):
+            bar.height = HISTOGRAM_HEIGHT * count / peak
+            bar.tooltip = f"{letter}: {count:,}"
+        self.summary.value = (
+            f"{sum(counts):,} letters · IoC {letter_counts.index_of_coincidence():.4f}"
+            f" · χ² vs English {letter_counts.chi_squared():.1f}"
+        )
+
+
+class SessionMemory:
+    # Approximate bytes held by one session, by source: the documents of
+    # each built tab and the session's result cache. The shared key cache
+    # is listed too, but left out of the total since every session in the
+    # process holds the same one.
+    def __init__(self):
+        self.sources = {}
+
+    def track(self, name, size):
+        self.sources[name] = size
+
+    def report(self):
+        usage = {name: size() for name, size in self.sources.items()}
+        usage["total"] = sum(usage.values())
+        usage["shared key cache"] = KEY_CACHE.bytes
+        return usage
 
 
 def main(page: ft.Page):
+    main_started = time.perf_counter()
     page.title = "Text Cipher App"
     page.theme_mode = ft.ThemeMode.DARK
     page.scroll = True
@@ -178,23 +251,73 @@ def main(page: ft.Page):
         content=get_theme_toggle()
     )
 
-    def show_error_snackbar(message):
-        page.snack_bar = ft.SnackBar(
-            content=ft.Text(message),
-            bgcolor="#F44336"
-        )
-        page.snack_bar.open = True
-        page.update()
+    update_meter = perf.UpdateMeter(page) if perf.ENABLED else None
+    result_cache = ResultCache(RESULT_CACHE_BYTES)
+    session_memory = page.session_memory = SessionMemory()
+    session_memory.track("result cache", lambda: result_cache.bytes)
+    pending_updates = {}
+
+    def mark_dirty(*controls):
+        for control in controls:
+            pending_updates[id(control)] = control
+
+    def flush_updates():
+        if pending_updates:
+            controls = list(pending_updates.values())
+            pending_updates.clear()
+            page.update(*controls)
+
+    snack_bar = ft.SnackBar(content=ft.Text(""))
+    last_error_shown = 0.0
+
+    def show_snackbar(message, bgcolor):
+        if snack_bar not in page.overlay:
+            page.overlay.append(snack_bar)
+            page.update()
+        snack_bar.content.value = message
+        snack_bar.bgcolor = bgcolor
+        snack_bar.open = False
+        snack_bar.open = True
+        mark_dirty(snack_bar)
+
+    def show_error_snackbar(message, throttle=False):
+        nonlocal last_error_shown
+        now = time.monotonic()
+        if throttle and now - last_error_shown < ERROR_SNACKBAR_THROTTLE:
+            return
+        last_error_shown = now
+        show_snackbar(message, "#F44336")
 
     def show_success_snackbar(message):
-        page.snack_bar = ft.SnackBar(
-            content=ft.Text(message),
-            bgcolor="#4CAF50"
-        )
-        page.snack_bar.open = True
-        page.update()
+        show_snackbar(message, "#4CAF50")
 
-    def build_cipher_tab(cipher_name, encrypt_fn, decrypt_fn, default_key="KEY", is_key_numeric=False):
+    file_handlers = {}
+
+    def on_upload_result(e):
+        handler = file_handlers.pop("upload", None)
+        if handler:
+            handler(e)
+
+    def on_save_result(e):
+        handler = file_handlers.pop("save", None)
+        if handler:
+            handler(e)
+
+    file_picker = ft.FilePicker(on_result=on_upload_result)
+    save_dialog = ft.FilePicker(on_result=on_save_result)
+
+    def ensure_file_pickers():
+        if file_picker not in page.overlay:
+            page.overlay.extend([file_picker, save_dialog])
+            page.update()
+
+    layout_listeners = []
+
+    # Key validators of the tabs built so far, for views that use every
+    # cipher's configured key.
+    configured_keys = {}
+
+    def build_cipher_tab(cipher_name, encrypt_fn, decrypt_fn, is_key_numeric=False):
         is_encrypt_mode = True
         
         input_text = ft.TextField(
@@ -209,7 +332,7 @@ def main(page: ft.Page):
         
         key_field = ft.TextField(
             label="Key",
-            value=default_key,
+            value=DEFAULT_KEYS[cipher_name],
             border_radius=10,
             filled=True,
             expand=True,
@@ -227,6 +350,51 @@ def main(page: ft.Page):
             text_size=16,
         )
 
+        input_document = None
+        output_value = ""
+
+        input_view = PagedTextView(page, "Input Text (large document)", on_clear=lambda: clear_input_document())
+        output_view = PagedTextView(page, "Output (large document)")
+        input_area = ft.Container(content=input_text)
+        output_area = ft.Container(content=output_text)
+
+        def get_input():
+            return (input_text.value or "") if input_document is None else input_document
+
+        def set_input(value):
+            nonlocal input_document
+            if value and len(value) > LARGE_TEXT_THRESHOLD:
+                input_document = value
+                input_text.value = ""
+                input_view.set_text(value)
+                input_area.content = input_view.control
+            else:
+                input_document = None
+                input_text.value = value
+                input_area.content = input_text
+            mark_dirty(input_area)
+
+        def show_output(value):
+            # Only what is shown; Save Output and Swap read output_value.
+            if len(value) > LARGE_TEXT_THRESHOLD:
+                output_text.value = ""
+                output_view.set_text(value)
+                output_area.content = output_view.control
+            else:
+                output_text.value = value
+                output_area.content = output_text
+            mark_dirty(output_area)
+
+        def set_output(value):
+            nonlocal output_value
+            output_value = value
+            show_output(value)
+
+        def clear_input_document():
+            set_input("")
+            update_output()
+            flush_updates()
+
         if cipher_name == "Caesar":
             key_field.hint_text = "Enter numeric key (-25 to 25)"
             key_field.keyboard_type = ft.KeyboardType.NUMBER
@@ -236,50 +404,25 @@ def main(page: ft.Page):
             key_field.hint_text = "Enter alphabetic key"
         elif cipher_name == "Monoalphabetic":
             key_field.hint_text = "Enter 26 unique letters (optional)"
-            key_field.value = ""
         elif cipher_name == "Substitution":
             key_field.hint_text = "Enter 26 unique letters"
-            key_field.value = "QWERTYUIOPLKJHGFDSAZXCVBNM"
         elif cipher_name == "Rail Fence":
             key_field.hint_text = "Enter number of rails (>1)"
             key_field.keyboard_type = ft.KeyboardType.NUMBER
-            key_field.value = "3"
         elif cipher_name == "Transposition":
             key_field.hint_text = "Enter number of columns (>1)"
             key_field.keyboard_type = ft.KeyboardType.NUMBER
-            key_field.value = "4"
         elif cipher_name == "Affine":
             key_field.hint_text = "Enter a,b format (e.g., 5,8)"
-            key_field.value = "5,8"
 
         def get_validated_inputs():
-            try:
-                text = CipherValidator.validate_text_input(input_text.value)
-                
-                if cipher_name == "Caesar":
-                    key = CipherValidator.validate_caesar_key(key_field.value)
-                elif cipher_name == "Vigenère":
-                    key = CipherValidator.validate_vigenere_key(key_field.value)
-                elif cipher_name == "Playfair":
-                    key = CipherValidator.validate_playfair_key(key_field.value)
-                elif cipher_name == "Monoalphabetic":
-                    key = CipherValidator.validate_monoalphabetic_key(key_field.value)
-                elif cipher_name == "Substitution":
-                    key = CipherValidator.validate_substitution_key(key_field.value)
-                elif cipher_name == "Rail Fence":
-                    key = CipherValidator.validate_rail_fence_key(key_field.value)
-                elif cipher_name == "Transposition":
-                    key = CipherValidator.validate_transposition_key(key_field.value)
-                elif cipher_name == "Affine":
-                    key = CipherValidator.validate_affine_key(key_field.value)
-                else:
-                    if not key_field.value or not key_field.value.strip():
-                        raise ValueError("Please enter a key.")
-                    key = key_field.value.strip()
-                
-                return text, key
-            except ValueError as e:
-                raise e
+            text = CipherValidator.validate_text_input(get_input())
+            return text, get_validated_key()
+
+        def get_validated_key():
+            return validate_key(cipher_name, key_field.value)
+
+        configured_keys[cipher_name] = get_validated_key
 
         mode_label = ft.Text("Encrypt", weight="w500", color="#4CAF50")
         
@@ -296,8 +439,12 @@ def main(page: ft.Page):
                 mode_label.color = "#2196F3"
                 encrypt_toggle.active_color = "#2196F3"
                 
+            mark_dirty(mode_label, encrypt_toggle)
             update_output()
-            page.update()
+            flush_updates()
+            perf.report("result cache", result_cache.stats())
+            perf.report("key cache", KEY_CACHE.stats())
+            perf.report("session memory", session_memory.report())
         
         encrypt_toggle = ft.Switch(
             value=True,
@@ -310,101 +457,435 @@ def main(page: ft.Page):
             encrypt_toggle,
         ], alignment=ft.MainAxisAlignment.END)
 
-        def update_output(_=None):
+        def set_input_error(message):
+            # The input field only goes out with an update when its error
+            # text actually changes; typing itself needs no echo.
+            if input_text.error_text != message:
+                input_text.error_text = message
+                mark_dirty(input_text)
+
+        def update_output(_=None, typing=False):
+            mark_dirty(key_field, output_text)
             try:
                 key_field.error_text = None
                 key_field.border_color = None
 
-                if not input_text.value or not input_text.value.strip():
-                    output_text.value = ""
-                    page.update()
+                text = get_input()
+                if not text or not text.strip():
+                    set_output("")
                     return
                 
                 text, key = get_validated_inputs()
+                mode = "encrypt" if is_encrypt_mode else "decrypt"
                 
-                if is_encrypt_mode:
-                    result = encrypt_fn(text, key)
-                else:
-                    result = decrypt_fn(text, key)
+                result = result_cache.get(cipher_name, key, mode, text)
+                if result is None:
+                    if is_encrypt_mode:
+                        result = encrypt_fn(text, key)
+                    else:
+                        result = decrypt_fn(text, key)
+                    result_cache.put(cipher_name, key, mode, text, result,
+                                     invertible=cipher_name in INVERTIBLE_CIPHERS)
                     
-                output_text.value = result
+                set_output(result)
                 
-                input_text.error_text = None
+                set_input_error(None)
                 
             except ValueError as e:
                 error_msg = str(e)
-                output_text.value = f"Error: {error_msg}"
+                set_output(f"Error: {error_msg}")
                 
                 if "text to process" in error_msg.lower():
-                    input_text.error_text = "Text is required"
+                    set_input_error("Text is required")
                 elif "key" in error_msg.lower():
                     key_field.error_text = error_msg.replace("Error: ", "")
                     key_field.border_color = ft.colors.RED
                 
-                show_error_snackbar(error_msg)
+                show_error_snackbar(error_msg, throttle=typing)
             
             except Exception as e:
                 error_msg = f"Cipher error: {str(e)}"
-                output_text.value = f"Error: {error_msg}"
-                show_error_snackbar(error_msg)
+                set_output(f"Error: {error_msg}")
+                show_error_snackbar(error_msg, throttle=typing)
             
-            page.update()
+            finally:
+                update_analytics()
+                update_sweep()
+
+        input_counts = LetterCounts()
+        output_counts = LetterCounts()
+        input_histogram = LetterHistogram("Input")
+        output_histogram = LetterHistogram("Output")
+        analytics_panel = ft.Row([input_histogram.control, output_histogram.control],
+                                 wrap=True, spacing=30, visible=False)
+
+        def update_analytics():
+            # Nothing is counted while the panel is hidden: for the ciphers
+            # that move every letter, one edit changes the whole output and
+            # the incremental count becomes a full recount. Opening the panel
+            # brings the counts up to date once.
+            if not analytics_panel.visible:
+                return
+            input_counts.update(get_input())
+            output_counts.update("" if output_value.startswith("Error:") else output_value)
+            input_histogram.show(input_counts)
+            output_histogram.show(output_counts)
+            mark_dirty(analytics_panel)
+
+        def toggle_analytics(e):
+            analytics_panel.visible = analytics_switch.value
+            update_analytics()
+            mark_dirty(analytics_panel)
+            flush_updates()
+
+        analytics_switch = ft.Switch(label="Analytics", value=False, on_change=toggle_analytics)
+
+        sweep_name = SWEEP_CIPHERS.get(cipher_name)
+        sweep_matrix = None
+        sweep_signature = None
+        sweep_keys = ft.TextField(
+            label="Keys to sweep",
+            value="",
+            hint_text="Leave empty for every key, or e.g. 2-10" if cipher_name in ("Caesar", "Affine", "Rail Fence", "Transposition")
+            else "Keys separated by commas",
+            dense=True,
+            expand=True,
+        )
+        sweep_status = ft.Text(size=12)
+        sweep_rows = ft.ListView(height=300, spacing=0)
+
+        def update_sweep():
+            # The whole key range is computed as one matrix; the list shows
+            # the first rows, and is only rebuilt when the input, keys or
+            # mode change.
+            nonlocal sweep_matrix, sweep_signature
+            if not sweep_panel.visible:
+                return
+            text = get_input().strip()[:SWEEP_TEXT_LIMIT]
+            signature = (text, sweep_keys.value, is_encrypt_mode)
+            if signature == sweep_signature:
+                return
+            sweep_signature = signature
+            sweep_matrix = None
+            sweep_rows.controls.clear()
+            mark_dirty(sweep_panel)
+            if not text:
+                sweep_status.value = ""
+                return
+            try:
+                keys = sweep.parse_keys(sweep_name, sweep_keys.value)
+                sweep_matrix = sweep.sweep(sweep_name, text, keys, "encrypt" if is_encrypt_mode else "decrypt")
+            except ValueError as e:
+                sweep_status.value = str(e)
+                return
+            status = f"{len(sweep_matrix):,} keys × {sweep_matrix.width:,} characters"
+            if len(get_input().strip()) > SWEEP_TEXT_LIMIT:
+                status += f" (first {SWEEP_TEXT_LIMIT:,} characters of the input)"
+            if len(sweep_matrix) > PAGE_LINES:
+                status += f", showing the first {PAGE_LINES}"
+            sweep_status.value = status
+            sweep_rows.controls = [
+                ft.Text(f"{key}: {row[:LINE_CHARS]}", size=13, font_family="monospace", no_wrap=True)
+                for key, row in zip(sweep_matrix.keys[:PAGE_LINES], sweep_matrix)
+            ]
+
+        def on_sweep_keys_change(_):
+            update_sweep()
+            flush_updates()
+
+        def save_sweep(_):
+            if sweep_matrix is None:
+                show_error_snackbar("No key sweep to save!")
+                flush_updates()
+                return
+            ensure_file_pickers()
+            file_handlers["save"] = save_sweep_result
+            save_dialog.save_file(
+                dialog_title="Save key sweep",
+                file_name=f"{sweep_name}_sweep.tsv",
+                allowed_extensions=["tsv", "txt"],
+            )
+
+        def save_sweep_result(e: ft.FilePickerResultEvent):
+            if e.path:
+                try:
+                    with open(e.path, "w", encoding="utf-8") as f:
+                        f.write(sweep_matrix.to_tsv())
+                    show_success_snackbar("Key sweep saved successfully!")
+                except Exception as ex:
+                    show_error_snackbar(f"Error saving file: {str(ex)}")
+                flush_updates()
+
+        def toggle_sweep(e):
+            sweep_panel.visible = sweep_switch.value
+            update_sweep()
+            mark_dirty(sweep_panel)
+            flush_updates()
+
+        sweep_keys.on_change = on_sweep_keys_change
+        sweep_panel = ft.Column([
+            ft.Row([
+                sweep_keys,
+                ft.TextButton("Save Sweep", icon=ft.Icons.DOWNLOAD, on_click=save_sweep),
+            ], vertical_alignment=ft.CrossAxisAlignment.CENTER),
+            sweep_status,
+            sweep_rows,
+        ], spacing=5, visible=False)
+        sweep_switch = ft.Switch(label="Key sweep", value=False, on_change=toggle_sweep,
+                                 visible=sweep_name is not None)
+
+        load_progress = ft.ProgressBar(value=0, expand=True)
+        load_status = ft.Text(size=12)
+        load_row = ft.Row([
+            load_progress,
+            load_status,
+            ft.TextButton("Cancel", icon=ft.Icons.CLOSE, on_click=lambda _: cancel_load()),
+        ], visible=False, vertical_alignment=ft.CrossAxisAlignment.CENTER)
+        load_cancel = threading.Event()
+
+        def cancel_load():
+            load_cancel.set()
+
+        def make_stream():
+            # Returns (key, mode, chunk transformer) for the current settings,
+            # or None when the whole text is needed before the cipher can run.
+            if cipher_name not in STREAMING_CIPHERS:
+                return None
+            try:
+                key = get_validated_key()
+            except ValueError:
+                return None
+            fn = encrypt_fn if is_encrypt_mode else decrypt_fn
+            offset = 0
+
+            def process(chunk):
+                nonlocal offset
+                chunk_key = key
+                if cipher_name == "Vigenère":
+                    phase = offset % len(key)
+                    chunk_key = key[phase:] + key[:phase]
+                offset += len(chunk)
+                return fn(chunk, chunk_key)
+
+            return key, "encrypt" if is_encrypt_mode else "decrypt", process
+
+        def load_file(path, cancel):
+            started = time.perf_counter()
+            size = os.path.getsize(path)
+            total = min(size, MAX_UPLOAD_BYTES)
+            decoder = codecs.getincrementaldecoder("utf-8")()
+            stream = make_stream()
+            parts, out_parts = [], []
+            leading = True
+            loaded = 0
+            last_preview = started
+
+            def consume(text):
+                nonlocal leading
+                parts.append(text)
+                if stream:
+                    # Leading whitespace is stripped before ciphering, and it
+                    # must not advance the Vigenère key.
+                    if leading:
+                        text = text.lstrip()
+                        leading = not text
+                    out_parts.append(stream[2](text))
+
+            load_progress.value = 0
+            load_status.value = "Loading..."
+            load_row.visible = True
+            page.update(load_row)
+
+            with open(path, "rb") as f:
+                # Packed ciphertext is recognised by its header and unpacked
+                # in one go; it is already a fraction of its text size.
+                is_packed = packed.is_packed(f.read(len(packed.MAGIC)))
+                f.seek(0)
+                if is_packed:
+                    if size > MAX_UPLOAD_BYTES:
+                        raise ValueError(f"Packed files larger than {MAX_UPLOAD_BYTES / 1048576:.0f} MB cannot be loaded.")
+                    consume(packed.unpack(f.read()))
+                    loaded = total
+                while loaded < total:
+                    if cancel.is_set():
+                        return False
+                    data = f.read(min(LOAD_CHUNK_BYTES, total - loaded))
+                    if not data:
+                        break
+                    loaded += len(data)
+                    consume(decoder.decode(data))
+
+                    load_progress.value = loaded / total
+                    load_status.value = f"{loaded / 1048576:.1f} of {total / 1048576:.1f} MB"
+                    if stream and time.perf_counter() - last_preview > 0.5:
+                        last_preview = time.perf_counter()
+                        # The preview is not the output until the load
+                        # finishes; a cancelled or failed load puts the
+                        # previous output back on screen.
+                        show_output("".join(out_parts))
+                        page.update(load_row, output_area)
+                    else:
+                        page.update(load_row)
+
+            if size <= MAX_UPLOAD_BYTES:
+                consume(decoder.decode(b"", True))
+            content = "".join(parts)
+            set_input(content)
+
+            stripped = content.strip()
+            if stream and stripped:
+                # The ciphers are length-preserving, so dropping the
+                # transformed trailing whitespace leaves the result for the
+                # stripped text.
+                key, mode, _ = stream
+                result = "".join(out_parts)[:len(stripped)]
+                result_cache.put(cipher_name, key, mode, stripped, result,
+                                 invertible=cipher_name in INVERTIBLE_CIPHERS)
+                set_output(result)
+                update_analytics()
+            else:
+                update_output()
+
+            perf.report("file load", f"{loaded / 1048576:.1f} MB in {time.perf_counter() - started:.2f} s")
+            if size > MAX_UPLOAD_BYTES:
+                show_error_snackbar(f"File is larger than {MAX_UPLOAD_BYTES / 1048576:.0f} MB; only the beginning was loaded.")
+            return True
+
+        def run_file_load(path, cancel):
+            try:
+                if load_file(path, cancel):
+                    show_success_snackbar("File uploaded successfully!")
+                else:
+                    show_output(output_value)
+                    show_error_snackbar("File loading cancelled.")
+            except Exception as e:
+                show_output(output_value)
+                show_error_snackbar(f"Error reading file: {str(e)}")
+            if cancel is load_cancel:
+                load_row.visible = False
+                mark_dirty(load_row)
+            flush_updates()
 
         def upload_file(e: ft.FilePickerResultEvent):
+            nonlocal load_cancel
             if e.files:
+                load_cancel.set()
+                load_cancel = threading.Event()
+                page.run_thread(run_file_load, e.files[0].path, load_cancel)
+
+        def pick_upload_file(_):
+            ensure_file_pickers()
+            file_handlers["upload"] = upload_file
+            file_picker.pick_files()
+
+        def pick_binary_file(_):
+            ensure_file_pickers()
+            file_handlers["upload"] = choose_binary_target
+            file_picker.pick_files(dialog_title="Choose a file to XOR")
+
+        def choose_binary_target(e: ft.FilePickerResultEvent):
+            if e.files:
+                source = e.files[0].path
+                file_handlers["save"] = lambda result: start_binary_xor(source, result)
+                save_dialog.save_file(
+                    dialog_title="Save XOR result",
+                    file_name=os.path.basename(source) + ".xor",
+                )
+
+        def start_binary_xor(source, e: ft.FilePickerResultEvent):
+            nonlocal load_cancel
+            if e.path:
                 try:
-                    with open(e.files[0].path, "r", encoding="utf-8") as f:
-                        content = f.read()
-                        input_text.value = content
-                    update_output()
-                    show_success_snackbar("File uploaded successfully!")
-                except Exception as e:
-                    show_error_snackbar(f"Error reading file: {str(e)}")
+                    key = get_validated_key()
+                except ValueError as ex:
+                    show_error_snackbar(str(ex))
+                    flush_updates()
+                    return
+                load_cancel.set()
+                load_cancel = threading.Event()
+                page.run_thread(run_binary_xor, source, e.path, key, load_cancel)
+
+        def run_binary_xor(source, target, key, cancel):
+            # Binary files never pass through the editor: the file is streamed
+            # from disk to disk, and XOR is its own inverse in either mode.
+            started = time.perf_counter()
+            load_progress.value = 0
+            load_status.value = "Processing..."
+            load_row.visible = True
+            page.update(load_row)
+
+            def progress(done, total):
+                load_progress.value = done / total
+                load_status.value = f"{done / 1048576:.1f} of {total / 1048576:.1f} MB"
+                page.update(load_row)
+
+            try:
+                if xor.xor_file(source, target, key, progress=progress, cancel=cancel):
+                    perf.report("binary XOR", f"{os.path.getsize(target) / 1048576:.1f} MB in {time.perf_counter() - started:.2f} s")
+                    show_success_snackbar("File processed successfully!")
+                else:
+                    show_error_snackbar("File processing cancelled.")
+            except Exception as ex:
+                show_error_snackbar(f"Error processing file: {str(ex)}")
+            if cancel is load_cancel:
+                load_row.visible = False
+                mark_dirty(load_row)
+            flush_updates()
 
         def download_file(e):
-            if output_text.value and not output_text.value.startswith("Error:"):
+            if output_value and not output_value.startswith("Error:"):
+                ensure_file_pickers()
+                file_handlers["save"] = save_file_result
                 save_dialog.save_file(
                     dialog_title="Save output text",
-                    file_type="txt",
-                    allowed_extensions=["txt"]
+                    file_type=ft.FilePickerFileType.CUSTOM,
+                    allowed_extensions=["txt", packed.EXTENSION]
                 )
             else:
                 show_error_snackbar("No valid output to save!")
+                flush_updates()
 
         def save_file_result(e: ft.FilePickerResultEvent):
             if e.path:
                 try:
-                    with open(e.path, "w", encoding="utf-8") as f:
-                        f.write(output_text.value)
+                    if e.path.lower().endswith("." + packed.EXTENSION):
+                        with open(e.path, "wb") as f:
+                            f.write(packed.pack(output_value))
+                    else:
+                        with open(e.path, "w", encoding="utf-8") as f:
+                            f.write(output_value)
                     show_success_snackbar("File saved successfully!")
                 except Exception as e:
                     show_error_snackbar(f"Error saving file: {str(e)}")
+                flush_updates()
 
         def swap_text(e):
-            if input_text.value or output_text.value:
-                if not output_text.value.startswith("Error:"):
-                    input_text.value, output_text.value = output_text.value, input_text.value
+            if get_input() or output_value:
+                if not output_value.startswith("Error:"):
+                    set_input(output_value)
                     update_output()
-                    page.update()
                 else:
                     show_error_snackbar("Cannot swap: Output contains an error!")
+                flush_updates()
+                perf.report("result cache", result_cache.stats())
+                perf.report("session memory", session_memory.report())
 
         def on_input_change(e):
-            input_text.error_text = None
-            update_output()
+            with perf.measure(update_meter, "keystroke"):
+                set_input_error(None)
+                update_output(typing=True)
+                flush_updates()
 
         def on_key_change(e):
-            key_field.error_text = None
-            key_field.border_color = None
-            update_output()
+            with perf.measure(update_meter, "key edit"):
+                key_field.error_text = None
+                key_field.border_color = None
+                update_output(typing=True)
+                flush_updates()
 
         input_text.on_change = on_input_change
         key_field.on_change = on_key_change
 
-        file_picker = ft.FilePicker(on_result=upload_file)
-        save_dialog = ft.FilePicker(on_result=save_file_result)
-        page.overlay.extend([file_picker, save_dialog])
-
         cipher_info = {
             "Playfair": "A symmetric encryption technique that uses a 5×5 grid of letters for encryption. Key must contain only letters.",
             "Monoalphabetic": "A substitution cipher that uses a fixed replacement for each letter. Key should be 26 unique letters (optional - uses default if empty).",
@@ -413,7 +894,8 @@ def main(page: ft.Page):
             "Substitution": "A monoalphabetic substitution cipher that replaces each letter with another letter from a 26-letter key. Key must be 26 unique letters.",
             "Rail Fence": "A transposition cipher that writes text in a zigzag pattern across multiple rails, then reads it off row by row. Key is the number of rails (must be >1).",
             "Transposition": "A columnar transposition cipher that arranges text in columns and reads it column by column. Key is the number of columns (must be >1).",
-            "Affine": "A mathematical cipher using the formula E(x)=(ax+b) mod 26. Key format is 'a,b' where 'a' must be coprime with 26 (valid: 1,3,5,7,9,11,15,17,19,21,23,25)."
+            "Affine": "A mathematical cipher using the formula E(x)=(ax+b) mod 26. Key format is 'a,b' where 'a' must be coprime with 26 (valid: 1,3,5,7,9,11,15,17,19,21,23,25).",
+            "XOR": "A byte-level stream cipher that XORs the data with a repeating text key, or with a pseudo-random keystream for keys of the form 'seed:42'. Ciphertext is shown as hexadecimal; use XOR File for binary files."
         }
 
         def get_action_buttons():
@@ -427,7 +909,7 @@ def main(page: ft.Page):
             upload_btn = ft.ElevatedButton(
                 "Upload File",
                 icon=ft.Icons.UPLOAD_FILE,
-                on_click=lambda _: file_picker.pick_files(),
+                on_click=pick_upload_file,
                 style=ft.ButtonStyle(shape=ft.RoundedRectangleBorder(radius=8)),
             )
             
@@ -438,19 +920,24 @@ def main(page: ft.Page):
                 style=ft.ButtonStyle(shape=ft.RoundedRectangleBorder(radius=8)),
             )
             
+            file_buttons = [upload_btn, save_btn]
+            if cipher_name == "XOR":
+                file_buttons.append(ft.ElevatedButton(
+                    "XOR File",
+                    icon=ft.Icons.INSERT_DRIVE_FILE,
+                    on_click=pick_binary_file,
+                    style=ft.ButtonStyle(shape=ft.RoundedRectangleBorder(radius=8)),
+                ))
+            
             if page.width < 600:
                 return ft.Column([
                     ft.Row([swap_btn], alignment=ft.MainAxisAlignment.CENTER),
-                    ft.Row([
-                        upload_btn,
-                        save_btn,
-                    ], alignment=ft.MainAxisAlignment.CENTER, spacing=10)
+                    ft.Row(file_buttons, alignment=ft.MainAxisAlignment.CENTER, spacing=10, wrap=True)
                 ], spacing=10, expand=True)
             else:
                 return ft.Row([
                     swap_btn,
-                    upload_btn,
-                    save_btn,
+                    *file_buttons,
                 ], spacing=10, alignment=ft.MainAxisAlignment.END)
 
         action_buttons = ft.Container(content=get_action_buttons())
@@ -487,19 +974,28 @@ def main(page: ft.Page):
             config_row,
             ft.Divider(height=2, thickness=1),
             ft.Text("Content", size=18, weight="w500"),
-            input_text,
+            input_area,
             action_buttons,
+            load_row,
             ft.Divider(height=2, thickness=1),
             ft.Text("Result", size=18, weight="w500"),
-            output_text
+            output_area,
+            analytics_switch,
+            analytics_panel,
+            sweep_switch,
+            sweep_panel,
         ], spacing=15, expand=True)
 
         def update_layout(_=None):
             action_buttons.content = get_action_buttons()
             config_row.content = get_config_row()
-            page.update()
+            mark_dirty(action_buttons, config_row)
 
-        page.on_resize = lambda e: update_layout()
+        layout_listeners.append(update_layout)
+        session_memory.track(f"{cipher_name} tab", lambda: (
+            sys.getsizeof(get_input()) + sys.getsizeof(output_value)
+            + (sys.getsizeof(sweep_matrix.data) if sweep_matrix else 0)
+        ))
 
         return ft.Container(
             content=cipher_content,
@@ -509,19 +1005,157 @@ def main(page: ft.Page):
             animate=ft.animation.Animation(300, ft.AnimationCurve.EASE_OUT),
         )
 
-    tab_contents = {
-        "Playfair": build_cipher_tab("Playfair", playfair.encrypt, playfair.decrypt),
-        "Monoalphabetic": build_cipher_tab("Monoalphabetic", monoalphabetic.encrypt, monoalphabetic.decrypt),
-        "Caesar": build_cipher_tab("Caesar", caesar.encrypt, caesar.decrypt, default_key="3", is_key_numeric=True),
-        "Vigenère": build_cipher_tab("Vigenère", vigenere.encrypt, vigenere.decrypt),
-        "Substitution": build_cipher_tab("Substitution", substitution.encrypt, substitution.decrypt, default_key="QWERTYUIOPLKJHGFDSAZXCVBNM"),
-        "Rail Fence": build_cipher_tab("Rail Fence", rail_fence.encrypt, rail_fence.decrypt, default_key="3", is_key_numeric=True),
-        "Transposition": build_cipher_tab("Transposition", transposition.encrypt, transposition.decrypt, default_key="4", is_key_numeric=True),
-        "Affine": build_cipher_tab("Affine", affine.encrypt, affine.decrypt, default_key="5,8"),
+    def build_compare_tab():
+        is_encrypt_mode = True
+        generation = 0
+
+        compare_input = ft.TextField(
+            label="Input Text",
+            multiline=True,
+            min_lines=3,
+            expand=True,
+            text_size=16,
+            border_radius=10,
+            filled=True,
+        )
+        mode_label = ft.Text("Encrypt", weight="w500", color="#4CAF50")
+        summary = ft.Text(size=12)
+
+        rows = {
+            name: (ft.Text(size=12, width=190), ft.Text(size=14, selectable=True, expand=True, font_family="monospace"))
+            for name in compare.CIPHERS
+        }
+        table = ft.Column([
+            ft.Row([ft.Text(name, weight="w500", width=120), timing, result],
+                   vertical_alignment=ft.CrossAxisAlignment.START)
+            for name, (timing, result) in rows.items()
+        ], spacing=8)
+
+        def toggle_mode(e):
+            nonlocal is_encrypt_mode
+            is_encrypt_mode = e.control.value
+            mode_label.value = "Encrypt" if is_encrypt_mode else "Decrypt"
+            mode_label.color = "#4CAF50" if is_encrypt_mode else "#2196F3"
+            e.control.active_color = mode_label.color
+            mark_dirty(mode_label, e.control)
+            if compare_input.value and compare_input.value.strip():
+                run_comparison()
+            flush_updates()
+
+        def run_comparison(_=None):
+            # Each cipher uses the key configured in its tab, or its default
+            # when the tab has not been opened.
+            nonlocal generation
+            try:
+                text = CipherValidator.validate_text_input(compare_input.value)
+            except ValueError as e:
+                show_error_snackbar(str(e))
+                flush_updates()
+                return
+            generation += 1
+            keys = {}
+            for name, (timing, result) in rows.items():
+                try:
+                    get_key = configured_keys.get(name)
+                    keys[name] = get_key() if get_key else validate_key(name, DEFAULT_KEYS[name])
+                except ValueError as e:
+                    timing.value = "Key error"
+                    result.value = str(e)
+                    continue
+                timing.value = "Running..."
+                result.value = ""
+            summary.value = f"Running {len(keys)} ciphers on {len(text):,} characters..."
+            mark_dirty(table, summary)
+            flush_updates()
+            page.run_thread(compare_in_background, text, keys, "encrypt" if is_encrypt_mode else "decrypt", generation)
+
+        def compare_in_background(text, keys, mode, run):
+            # Rows are filled in as the ciphers finish; a newer run makes
+            # the remaining results of this one stale.
+            started = time.perf_counter()
+
+            def show(name, outcome):
+                if run != generation:
+                    return
+                timing, result = rows[name]
+                if isinstance(outcome, Exception):
+                    timing.value = "Error"
+                    result.value = str(outcome)
+                else:
+                    output, seconds = outcome
+                    timing.value = f"{seconds * 1000:.1f} ms"
+                    if seconds:
+                        timing.value += f" · {len(text) / seconds / 1e6:.1f} M chars/s"
+                    result.value = output[:LINE_CHARS]
+                page.update(timing, result)
+
+            compare.compare(text, keys, mode, on_result=show)
+            if run == generation:
+                summary.value = f"{len(keys)} ciphers on {len(text):,} characters in {(time.perf_counter() - started) * 1000:.0f} ms"
+                page.update(summary)
+
+        compare_content = ft.Column([
+            ft.Card(
+                content=ft.Container(
+                    content=ft.Text(
+                        "Runs all eight ciphers on the same input at once, each with the key set in its tab "
+                        "(or its default), and shows every result with its time and throughput.",
+                        size=14,
+                        color="#FFFFFF" if is_dark else "#000000"
+                    ),
+                    padding=10,
+                ),
+                elevation=0,
+                color="#303030" if is_dark else "#E0E0E0",
+                margin=ft.margin.only(bottom=15)
+            ),
+            ft.Text("Content", size=18, weight="w500"),
+            compare_input,
+            ft.Row([
+                mode_label,
+                ft.Switch(value=True, active_color="#4CAF50", on_change=toggle_mode),
+                ft.ElevatedButton(
+                    "Run All",
+                    icon=ft.Icons.PLAY_ARROW,
+                    on_click=run_comparison,
+                    style=ft.ButtonStyle(shape=ft.RoundedRectangleBorder(radius=8)),
+                ),
+            ], spacing=10, alignment=ft.MainAxisAlignment.END, vertical_alignment=ft.CrossAxisAlignment.CENTER),
+            ft.Divider(height=2, thickness=1),
+            ft.Row([ft.Text("Results", size=18, weight="w500", expand=True), summary]),
+            table,
+        ], spacing=15, expand=True)
+
+        return ft.Container(
+            content=compare_content,
+            padding=15,
+            border_radius=12,
+            expand=True,
+            animate=ft.animation.Animation(300, ft.AnimationCurve.EASE_OUT),
+        )
+
+    cipher_tabs = {
+        "Playfair": lambda: build_cipher_tab("Playfair", playfair.encrypt, playfair.decrypt),
+        "Monoalphabetic": lambda: build_cipher_tab("Monoalphabetic", monoalphabetic.encrypt, monoalphabetic.decrypt),
+        "Caesar": lambda: build_cipher_tab("Caesar", caesar.encrypt, caesar.decrypt, is_key_numeric=True),
+        "Vigenère": lambda: build_cipher_tab("Vigenère", vigenere.encrypt, vigenere.decrypt),
+        "Substitution": lambda: build_cipher_tab("Substitution", substitution.encrypt, substitution.decrypt),
+        "Rail Fence": lambda: build_cipher_tab("Rail Fence", rail_fence.encrypt, rail_fence.decrypt, is_key_numeric=True),
+        "Transposition": lambda: build_cipher_tab("Transposition", transposition.encrypt, transposition.decrypt, is_key_numeric=True),
+        "Affine": lambda: build_cipher_tab("Affine", affine.encrypt, affine.decrypt),
+        "XOR": lambda: build_cipher_tab("XOR", xor.encrypt_hex, xor.decrypt_hex),
+        "All Ciphers": build_compare_tab,
     }
 
+    tab_contents = {}
+
+    def get_tab_content(cipher_name):
+        if cipher_name not in tab_contents:
+            tab_contents[cipher_name] = cipher_tabs[cipher_name]()
+        return tab_contents[cipher_name]
+
     switcher = ft.AnimatedSwitcher(
-        content=tab_contents["Playfair"],
+        content=get_tab_content("Playfair"),
         transition=ft.AnimatedSwitcherTransition.FADE,
         duration=300,
         expand=True
@@ -529,7 +1163,7 @@ def main(page: ft.Page):
 
     def tab_changed(e):
         selected_tab = e.control.tabs[e.control.selected_index].text
-        switcher.content = tab_contents[selected_tab]
+        switcher.content = get_tab_content(selected_tab)
         page.update()
 
     def get_tabs():
@@ -560,6 +1194,8 @@ def main(page: ft.Page):
                     ft.Tab(text="Rail Fence", icon=ft.Icons.RAILWAY_ALERT),
                     ft.Tab(text="Transposition", icon=ft.Icons.TABLE_ROWS),
                     ft.Tab(text="Affine", icon=ft.Icons.FUNCTIONS),
+                    ft.Tab(text="XOR", icon=ft.Icons.MEMORY),
+                    ft.Tab(text="All Ciphers", icon=ft.Icons.COMPARE_ARROWS),
                 ],
                 expand=False,
             )
@@ -576,7 +1212,7 @@ def main(page: ft.Page):
 
     def show_cipher_selector():
         cipher_names = ["Playfair", "Monoalphabetic", "Caesar", "Vigenère", 
-                       "Substitution", "Rail Fence", "Transposition", "Affine"]
+                       "Substitution", "Rail Fence", "Transposition", "Affine", "XOR", "All Ciphers"]
         
         def select_cipher(e):
             cipher_index = int(e.control.data)
@@ -610,9 +1246,9 @@ def main(page: ft.Page):
 
     def set_tab_content(index):
         tab_names = ["Playfair", "Monoalphabetic", "Caesar", "Vigenère", 
-                    "Substitution", "Rail Fence", "Transposition", "Affine"]
+                    "Substitution", "Rail Fence", "Transposition", "Affine", "XOR", "All Ciphers"]
         if index < len(tab_names):
-            switcher.content = tab_contents[tab_names[index]]
+            switcher.content = get_tab_content(tab_names[index])
             page.update()
 
     tabs_container = ft.Container(content=get_tabs())
@@ -643,14 +1279,21 @@ def main(page: ft.Page):
 
     def update_header(e=None):
         header_container.content = get_header()
-        page.update()
+        mark_dirty(header_container)
 
     def update_tabs(e=None):
         tabs_container.content = get_tabs()
         theme_toggle_container.content = get_theme_toggle()
-        page.update()
+        mark_dirty(tabs_container, theme_toggle_container)
+
+    def on_resize(e):
+        update_header(e)
+        update_tabs(e)
+        for update_layout in layout_listeners:
+            update_layout()
+        flush_updates()
 
-    page.on_resize = lambda e: (update_header(e), update_tabs(e))
+    page.on_resize = on_resize
 
     page.add(
         header_container,
@@ -658,6 +1301,9 @@ def main(page: ft.Page):
         switcher
     )
 
+    perf.report("main() to first frame", f"{(time.perf_counter() - main_started) * 1000:.1f} ms")
+    perf.report("process start to first frame", f"{perf.seconds_since_process_start() * 1000:.1f} ms")
+
 
 if __name__ == "__main__":
     ft.app(target=main)
@@ -0,0 +1,73 @@
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+
+_IMPORTED_AT = time.perf_counter()
+
+ENABLED = bool(os.environ.get("CIPHER_APP_PERF"))
+
+
+def seconds_since_process_start():
+    try:
+        with open("/proc/self/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, AttributeError):
+        # No procfs: fall back to the moment this module was first imported,
+        # which main.py does before loading Flet.
+        return time.perf_counter() - _IMPORTED_AT
+
+
+def report(label, value):
+    if ENABLED:
+        print(f"[perf] {label}: {value}", file=sys.stderr)
+
+
+def _encode(obj):
+    return getattr(obj, "__dict__", str(obj))
+
+
+class UpdateMeter:
+    # Counts the messages Flet sends to the client and their JSON size. The
+    # connection is a private attribute of ft.Page; when it is not reachable
+    # only update calls are counted and bytes stay at zero.
+    def __init__(self, page):
+        self.messages = 0
+        self.bytes = 0
+        conn = getattr(page, "_Page__conn", None)
+        if conn is not None and hasattr(conn, "send_commands"):
+            send_commands = conn.send_commands
+
+            def metered_send_commands(session_id, commands):
+                self.messages += 1
+                self.bytes += len(json.dumps(commands, default=_encode))
+                return send_commands(session_id, commands)
+
+            conn.send_commands = metered_send_commands
+        else:
+            update = page.update
+
+            def metered_update(*controls):
+                self.messages += 1
+                return update(*controls)
+
+            page.update = metered_update
+
+
+@contextmanager
+def _measure(meter, label):
+    messages, sent = meter.messages, meter.bytes
+    started = time.perf_counter()
+    yield
+    elapsed = (time.perf_counter() - started) * 1000
+    report(label, f"{meter.messages - messages} messages, {meter.bytes - sent} bytes, {elapsed:.1f} ms")
+
+
+def measure(meter, label):
+    if meter is None:
+        return nullcontext()
+    return _measure(meter, label)
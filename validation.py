@@ -0,0 +1,191 @@
+import re
+
+from ciphers import affine, xor
+from ciphers.alphabet import LATIN
+
+DEFAULT_KEYS = {
+    "Playfair": "KEY",
+    "Monoalphabetic": "",
+    "Caesar": "3",
+    "Vigenère": "KEY",
+    "Substitution": "QWERTYUIOPLKJHGFDSAZXCVBNM",
+    "Rail Fence": "3",
+    "Transposition": "4",
+    "Affine": "5,8",
+    "XOR": "seed:42",
+}
+
+
+class CipherValidator:    
+    @staticmethod
+    def validate_text_input(text):
+        if not text or not text.strip():
+            raise ValueError("Please enter the text to process.")
+        return text.strip()
+    
+    @staticmethod
+    def validate_caesar_key(key, alphabet=LATIN):
+        if not key or not key.strip():
+            raise ValueError("Please enter a key.")
+        
+        limit = alphabet.size - 1
+        try:
+            shift = int(key.strip())
+            if shift < -limit or shift > limit:
+                raise ValueError(f"Caesar cipher key must be a number between -{limit} and {limit}.")
+            return shift
+        except ValueError as e:
+            if "invalid literal" in str(e):
+                raise ValueError(f"Caesar cipher key must be a number between -{limit} and {limit}.")
+            raise
+    
+    @staticmethod
+    def validate_vigenere_key(key, alphabet=LATIN):
+        if not key or not key.strip():
+            raise ValueError("Please enter a key.")
+        
+        key = key.strip()
+        if not alphabet.contains(key):
+            raise ValueError(f"Vigenère cipher key must contain only {alphabet.noun}.")
+        return key
+    
+    @staticmethod
+    def validate_playfair_key(key, alphabet=LATIN):
+        if not key or not key.strip():
+            raise ValueError("Please enter a key.")
+        
+        key = key.strip()
+        if not alphabet.contains(key):
+            raise ValueError(f"Playfair cipher key must contain only {alphabet.noun}.")
+        return key
+    
+    @staticmethod
+    def validate_monoalphabetic_key(key, alphabet=LATIN):
+        if not key or not key.strip():
+            return "QWERTYUIOPLKJHGFDSAZXCVBNM" if alphabet == LATIN else alphabet.symbols[::-1]
+        
+        key = key.strip()
+        message = f"The substitution key must be exactly {alphabet.size} unique {alphabet.noun}."
+        
+        if not alphabet.contains(key):
+            raise ValueError(message)
+        
+        key = ''.join(alphabet.canonical(c) for c in key)
+        
+        if len(key) != alphabet.size:
+            raise ValueError(message)
+        
+        if len(set(key)) != alphabet.size:
+            raise ValueError(message)
+        
+        return key
+    
+    @staticmethod
+    def validate_rail_fence_key(key):
+        if not key or not key.strip():
+            raise ValueError("Please enter a key.")
+        
+        try:
+            rails = int(key.strip())
+            if rails < 2:
+                raise ValueError("Rail fence cipher key must be a number greater than 1.")
+            return rails
+        except ValueError as e:
+            if "invalid literal" in str(e):
+                raise ValueError("Rail fence cipher key must be a number greater than 1.")
+            raise
+    
+    @staticmethod
+    def validate_transposition_key(key):
+        if not key or not key.strip():
+            raise ValueError("Please enter a key.")
+        
+        try:
+            columns = int(key.strip())
+            if columns < 2:
+                raise ValueError("Transposition cipher key must be a number greater than 1.")
+            return columns
+        except ValueError as e:
+            if "invalid literal" in str(e):
+                raise ValueError("Transposition cipher key must be a number greater than 1.")
+            raise
+    
+    @staticmethod
+    def validate_affine_key(key, alphabet=LATIN):
+        if not key or not key.strip():
+            raise ValueError("Please enter a key.")
+        
+        key = key.strip()
+        
+        if not re.match(r'^\d+,\d+$', key):
+            raise ValueError("Affine cipher key must be in format 'a,b' (e.g., '5,8').")
+        
+        try:
+            a, b = map(int, key.split(','))
+            
+            if a not in affine.valid_a_values(alphabet.size):
+                raise ValueError(f"The 'a' value must be coprime with {alphabet.size}.")
+            
+            return key
+        except ValueError as e:
+            if "invalid literal" in str(e):
+                raise ValueError("Affine cipher key must be in format 'a,b' (e.g., '5,8').")
+            raise
+    
+    @staticmethod
+    def validate_substitution_key(key, alphabet=LATIN):
+        if not key or not key.strip():
+            raise ValueError("Please enter a key.")
+        
+        key = key.strip()
+        message = f"Substitution cipher key must be {alphabet.size} unique {alphabet.noun}."
+        
+        if len(key) != alphabet.size:
+            raise ValueError(message)
+        
+        if not alphabet.contains(key):
+            raise ValueError(message)
+        
+        key = ''.join(alphabet.canonical(c) for c in key)
+        
+        if len(set(key)) != alphabet.size:
+            raise ValueError(message)
+        
+        return key
+    
+    @staticmethod
+    def validate_xor_key(key):
+        if not key or not key.strip():
+            raise ValueError("Please enter a key.")
+        
+        key = key.strip()
+        if key.startswith(xor.SEED_PREFIX):
+            try:
+                int(key[len(xor.SEED_PREFIX):])
+            except ValueError:
+                raise ValueError("XOR seed key must be 'seed:' followed by a whole number (e.g., 'seed:42').")
+        return key
+
+
+def validate_key(cipher_name, key):
+    if cipher_name == "Caesar":
+        return CipherValidator.validate_caesar_key(key)
+    elif cipher_name == "Vigenère":
+        return CipherValidator.validate_vigenere_key(key)
+    elif cipher_name == "Playfair":
+        return CipherValidator.validate_playfair_key(key)
+    elif cipher_name == "Monoalphabetic":
+        return CipherValidator.validate_monoalphabetic_key(key)
+    elif cipher_name == "Substitution":
+        return CipherValidator.validate_substitution_key(key)
+    elif cipher_name == "Rail Fence":
+        return CipherValidator.validate_rail_fence_key(key)
+    elif cipher_name == "Transposition":
+        return CipherValidator.validate_transposition_key(key)
+    elif cipher_name == "Affine":
+        return CipherValidator.validate_affine_key(key)
+    elif cipher_name == "XOR":
+        return CipherValidator.validate_xor_key(key)
+    if not key or not key.strip():
+        raise ValueError("Please enter a key.")
+    return key.strip()
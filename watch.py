@@ -0,0 +1,319 @@
+import argparse
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from ciphers import packed, xor
+from ciphers.compare import CIPHERS
+from validation import CipherValidator, DEFAULT_KEYS, validate_key
+
+WATCH_CIPHERS = sorted([*CIPHERS, "XOR"])
+# Ciphers that can put the spaces they drop back into the output.
+LAYOUT_CIPHERS = {"Playfair", "Transposition"}
+LATENCY_WINDOW = 1000
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+def write_atomic(path, data):
+    # Readers of the output directory never see a half-written file: the
+    # result goes to a temporary file that replaces the target in one step.
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def transform_file(source, target, cipher, key, mode="encrypt", pack=False, keep_layout=False):
+    # Module-level so that it can run in a worker process. Returns the
+    # number of input bytes processed.
+    if cipher == "XOR":
+        xor.xor_file(source, target, key)
+        return os.path.getsize(source)
+    with open(source, "rb") as f:
+        data = f.read()
+    text = packed.unpack(data) if packed.is_packed(data) else data.decode("utf-8")
+    text = CipherValidator.validate_text_input(text)
+    fn = getattr(CIPHERS[cipher], mode)
+    result = fn(text, key, keep_layout=True) if keep_layout and cipher in LAYOUT_CIPHERS else fn(text, key)
+    write_atomic(target, packed.pack(result) if pack else result.encode("utf-8"))
+    return len(data)
+
+
+class WatchStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.done = 0
+        self.failed = 0
+        self.bytes = 0
+        self.in_flight = 0
+        self.blocked = 0.0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.waits = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def begin(self, waited):
+        with self._lock:
+            self.in_flight += 1
+            self.waits.append(waited)
+
+    def finish(self, latency, size=None):
+        # size is None when the file failed.
+        with self._lock:
+            self.in_flight -= 1
+            if size is None:
+                self.failed += 1
+            else:
+                self.done += 1
+                self.bytes += size
+                self.latencies.append(latency)
+
+    def add_blocked(self, seconds):
+        with self._lock:
+            self.blocked += seconds
+
+    def report(self, depth):
+        with self._lock:
+            elapsed = time.perf_counter() - self.started
+            return {
+                "queue_depth": depth,
+                "in_flight": self.in_flight,
+                "done": self.done,
+                "failed": self.failed,
+                "files_per_sec": self.done / elapsed if elapsed else 0.0,
+                "mb_per_sec": self.bytes / elapsed / 1e6 if elapsed else 0.0,
+                "latency_p50_ms": percentile(self.latencies, 0.5) * 1000,
+                "latency_p95_ms": percentile(self.latencies, 0.95) * 1000,
+                "queue_wait_p95_ms": percentile(self.waits, 0.95) * 1000,
+                "blocked_seconds": self.blocked,
+            }
+
+
+class FolderWatcher:
+    # One thread polls the input directory and puts files that have stopped
+    # changing onto a bounded queue; worker threads take them off and write
+    # the results. When the workers fall behind the queue fills up, and the
+    # poller blocks on put() instead of reading the directory any further.
+    def __init__(self, source_dir, target_dir, cipher, key, mode="encrypt", workers=4,
+                 queue_size=64, interval=1.0, pack=False, keep_layout=False, processes=False, log=None):
+        if os.path.realpath(source_dir) == os.path.realpath(target_dir):
+            raise ValueError("The output directory must differ from the watched directory.")
+        if cipher not in WATCH_CIPHERS:
+            raise ValueError(f"Unknown cipher {cipher!r}; choose from {', '.join(WATCH_CIPHERS)}.")
+        if pack and cipher == "XOR":
+            raise ValueError("XOR output is binary and cannot be packed.")
+        self.source_dir = source_dir
+        self.target_dir = target_dir
+        self.cipher = cipher
+        self.key = validate_key(cipher, key)
+        self.mode = mode
+        self.workers = workers
+        self.interval = interval
+        self.pack = pack
+        self.keep_layout = keep_layout
+        self.log = log or (lambda message: print(message, file=sys.stderr))
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.stats = WatchStats()
+        self.stop_event = threading.Event()
+        self._closing = threading.Event()
+        self._pool = ProcessPoolExecutor(max_workers=workers) if processes and cipher != "XOR" else None
+        self._pool_lock = threading.Lock()
+        self._threads = []
+        # name -> (size, mtime_ns) as last queued, and as seen on the last
+        # scan for files still waiting to settle.
+        self._queued = {}
+        self._settling = {}
+        # Names queued or being processed. A file that changes meanwhile
+        # waits for its turn to end, so two workers never write one target.
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+
+    def target_path(self, name):
+        return os.path.join(self.target_dir, f"{name}.{packed.EXTENSION}" if self.pack else name)
+
+    def _is_current(self, name, signature):
+        # Outputs newer than their input are left alone, so a restarted
+        # watcher does not redo finished files.
+        try:
+            return os.stat(self.target_path(name)).st_mtime_ns >= signature[1]
+        except OSError:
+            return False
+
+    def scan(self):
+        ready = []
+        seen = {}
+        with os.scandir(self.source_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or entry.name.endswith(".tmp") or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                signature = seen[entry.name] = (stat.st_size, stat.st_mtime_ns)
+                if self._queued.get(entry.name) == signature or self._is_pending(entry.name):
+                    continue
+                # A file is picked up once two scans in a row see the same
+                # size and modification time, so partial copies are skipped.
+                if self._settling.get(entry.name) == signature:
+                    if self._is_current(entry.name, signature):
+                        self._queued[entry.name] = signature
+                    else:
+                        ready.append((entry.name, signature))
+        self._settling = seen
+        for name in [name for name in self._queued if name not in seen]:
+            del self._queued[name]
+        return sorted(ready)
+
+    def _is_pending(self, name):
+        with self._pending_lock:
+            return name in self._pending
+
+    def _enqueue(self, item):
+        started = time.perf_counter()
+        while not self.stop_event.is_set():
+            try:
+                self.queue.put(item, timeout=0.5)
+                break
+            except queue.Full:
+                pass
+        blocked = time.perf_counter() - started
+        if blocked > 0.01:
+            self.stats.add_blocked(blocked)
+        return not self.stop_event.is_set()
+
+    def _poll(self):
+        while not self.stop_event.is_set():
+            try:
+                ready = self.scan()
+            except OSError as e:
+                self.log(f"Could not read {self.source_dir}: {e}")
+                ready = []
+            for name, signature in ready:
+                with self._pending_lock:
+                    self._pending.add(name)
+                if not self._enqueue((name, time.perf_counter())):
+                    with self._pending_lock:
+                        self._pending.discard(name)
+                    return
+                self._queued[name] = signature
+            self.stop_event.wait(self.interval)
+
+    def _transform(self, args):
+        if not self._pool:
+            return transform_file(*args)
+        pool = self._pool
+        try:
+            return pool.submit(transform_file, *args).result()
+        except BrokenProcessPool:
+            # A worker process died (killed for memory, say); the files
+            # after this one get a fresh pool.
+            with self._pool_lock:
+                if self._pool is pool:
+                    self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            raise
+
+    def _work(self):
+        # Runs until stop() and an empty queue; no error in one file ends
+        # the loop, so the queue keeps draining.
+        while True:
+            try:
+                name, queued_at = self.queue.get(timeout=0.2)
+            except queue.Empty:
+                if self._closing.is_set():
+                    return
+                continue
+            self.stats.begin(time.perf_counter() - queued_at)
+            args = (os.path.join(self.source_dir, name), self.target_path(name),
+                    self.cipher, self.key, self.mode, self.pack, self.keep_layout)
+            size = None
+            try:
+                size = self._transform(args)
+            except (OSError, UnicodeDecodeError, ValueError) as e:
+                self.log(f"{name}: {e}")
+            except Exception as e:
+                self.log(f"{name}: {type(e).__name__}: {e}")
+            finally:
+                with self._pending_lock:
+                    self._pending.discard(name)
+                self.stats.finish(time.perf_counter() - queued_at, size)
+                self.queue.task_done()
+
+    def start(self):
+        os.makedirs(self.target_dir, exist_ok=True)
+        self._threads = [threading.Thread(target=self._work, daemon=True) for _ in range(self.workers)]
+        self._threads.append(threading.Thread(target=self._poll, daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        # Files already queued are finished before the workers exit; the
+        # workers see the queue run empty, so nothing is put on it here.
+        self.stop_event.set()
+        self._threads[-1].join()
+        self._closing.set()
+        for thread in self._threads[:-1]:
+            thread.join()
+        if self._pool:
+            self._pool.shutdown()
+
+    def report(self):
+        return self.stats.report(self.queue.qsize())
+
+
+def format_report(report):
+    return (f"queue {report['queue_depth']}, in flight {report['in_flight']}, "
+            f"done {report['done']}, failed {report['failed']} | "
+            f"{report['files_per_sec']:.1f} files/s, {report['mb_per_sec']:.2f} MB/s | "
+            f"latency p50 {report['latency_p50_ms']:.1f} ms, p95 {report['latency_p95_ms']:.1f} ms, "
+            f"queue wait p95 {report['queue_wait_p95_ms']:.1f} ms | "
+            f"blocked on full queue {report['blocked_seconds']:.1f} s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Encrypt or decrypt every file dropped into a directory.")
+    parser.add_argument("source_dir", help="directory to watch")
+    parser.add_argument("target_dir", help="directory the results are written to")
+    parser.add_argument("--cipher", default="Caesar", choices=WATCH_CIPHERS)
+    parser.add_argument("--key", help="cipher key (default: the app's default key for the cipher)")
+    parser.add_argument("--mode", default="encrypt", choices=["encrypt", "decrypt"])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--queue-size", type=int, default=64, help="files waiting before the watcher stops scanning")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between directory scans")
+    parser.add_argument("--report-every", type=float, default=10.0, help="seconds between status lines")
+    parser.add_argument("--packed", action="store_true", help=f"write .{packed.EXTENSION} packed output")
+    parser.add_argument("--keep-layout", action="store_true",
+                        help="put removed spaces back in place (Playfair, Transposition)")
+    parser.add_argument("--processes", action="store_true", help="run the ciphers in worker processes")
+    args = parser.parse_args(argv)
+
+    key = DEFAULT_KEYS[args.cipher] if args.key is None else args.key
+    try:
+        watcher = FolderWatcher(args.source_dir, args.target_dir, args.cipher, key, args.mode,
+                                max(1, args.workers), max(1, args.queue_size), args.interval,
+                                args.packed, args.keep_layout, args.processes)
+    except ValueError as e:
+        parser.error(str(e))
+
+    watcher.start()
+    print(f"Watching {args.source_dir} ({args.cipher}, {args.mode}) -> {args.target_dir}; Ctrl+C to stop",
+          file=sys.stderr)
+    try:
+        while True:
+            time.sleep(args.report_every)
+            print(format_report(watcher.report()), file=sys.stderr)
+    except KeyboardInterrupt:
+        print("Stopping; finishing queued files...", file=sys.stderr)
+    watcher.stop()
+    print(format_report(watcher.report()), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()